@@ -0,0 +1,67 @@
+"""
+Micro-benchmark of the exact integer balancer against the `sympy.linsolve` path it replaced.
+
+Requires sympy only for the comparison column. Run from the repository root:
+
+    python benchmarks/bench_balance.py
+"""
+from chempy import Equation
+from chempy.utils import balance_coefficients
+from fractions import Fraction
+from string import ascii_lowercase
+import timeit
+
+
+EQUATIONS = {
+    'combustion': 'C3H8 + O2 -> CO2 + H2O',
+    'redox': 'KMnO4 + HCl = KCl + MnCl2 + H2O + Cl2',
+    'notebook': 'K4Fe(CN)6 + K[(MnO4)15]2 + H2SO4 = KHSO4 + Fe2(SO4)3 + MnSO4 + HNO3 + CO2 + H2O',
+    'underdetermined': 'H2 + O2 -> H2O + H2O2',
+}
+
+
+def legacy_coefficients(data: list[list[int]]) -> list[int]:
+    """The `sympy.linsolve` balancing path as it was before `balance_coefficients`, kept here only for comparison."""
+    import sympy as smp
+    matrix = smp.Matrix(data)
+    symbols = [smp.Symbol(f'{ascii_lowercase[n]}') for n in range(matrix.shape[1])]
+    solutions = smp.linsolve(matrix, symbols).subs([(symbol, 1) for symbol in symbols])
+    args = [Fraction(abs(arg)).limit_denominator() for arg in solutions.args[0]]
+    while not all(arg.denominator == 1 for arg in args):
+        args = [arg * max(frac.denominator for frac in args) for arg in args]
+    return [arg.numerator for arg in args]
+
+
+def balance_matrix(line: str) -> list[list[int]]:
+    equation = Equation.parse_from_string(line)
+    elements = equation.total_left() | equation.total_right()
+    return [equation.count_left(element) + [-count for count in equation.count_right(element)]
+            for element in elements]
+
+
+def best_of(func, matrix: list[list[int]], repeat: int = 5) -> float:
+    """Returns the best time of one `func(matrix)` call in seconds."""
+    timer = timeit.Timer(lambda: func(matrix))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main() -> None:
+    try:
+        import sympy  # noqa: F401
+    except ImportError:
+        sympy = None
+    print(f'{"equation":<17}{"sympy (us)":>12}{"exact (us)":>12}{"speedup":>10}  coefficients')
+    for name, line in EQUATIONS.items():
+        matrix = balance_matrix(line)
+        exact = best_of(balance_coefficients, matrix)
+        coefficients = balance_coefficients(matrix)
+        if sympy is None:
+            print(f'{name:<17}{"-":>12}{exact * 1e6:>12.1f}{"-":>10}  {coefficients}')
+            continue
+        legacy = best_of(legacy_coefficients, matrix)
+        print(f'{name:<17}{legacy * 1e6:>12.1f}{exact * 1e6:>12.1f}{legacy / exact:>9.0f}x  {coefficients}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Molar masses of a large formula column: one `Compound` at a time against `chempy.columnar`.
+
+Run from the repository root:
+
+    python benchmarks/bench_columnar.py [--rows N]
+"""
+from chempy import Compound
+from chempy.columnar import composition_matrix, molar_masses
+import argparse
+import numpy as np
+import time
+
+
+FORMULAS = ['H2O', 'CO2', 'C6H12O6', 'NaCl', 'K4Fe(CN)6', 'Fe2(SO4)3', '[Cu(H2O)4](NO3)2',
+            'CuSO4·5H2O', 'C60H122', 'SO4^2-', 'NH4+', 'Ca3(PO4)2', 'C2H5OH', 'KMnO4']
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200_000)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    column = np.array(FORMULAS)[rng.integers(len(FORMULAS), size=args.rows)]
+
+    start = time.perf_counter()
+    scalar = np.array([Compound(str(formula)).molar_mass for formula in column])
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrix = composition_matrix(column)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    vectorized = molar_masses(matrix)
+    dot_time = time.perf_counter() - start
+
+    assert np.allclose(scalar, vectorized)
+    print(f'rows: {args.rows:,}')
+    print(f'Compound(...).molar_mass   {scalar_time * 1e3:10.1f} ms')
+    print(f'composition_matrix         {build_time * 1e3:10.1f} ms')
+    print(f'molar_masses (matvec)      {dot_time * 1e3:10.1f} ms')
+    print(f'speedup (end to end)       {scalar_time / (build_time + dot_time):10.1f}x')
+
+
+if __name__ == '__main__':
+    main()
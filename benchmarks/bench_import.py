@@ -0,0 +1,49 @@
+"""
+Startup benchmark: checks that `import chempy` stays under a time budget.
+
+Each sample runs `python -c "import chempy"` in a fresh interpreter and subtracts
+the cost of a bare `python -c "pass"`, so the reported figure is the import
+itself. Exits with status 1 if the median exceeds the budget.
+
+    python benchmarks/bench_import.py [--budget-ms 150] [--runs 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+def run_once(code: str) -> float:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], check=True, env=env, cwd=ROOT)
+    return time.perf_counter() - start
+
+
+def median_time(code: str, runs: int) -> float:
+    run_once(code)  # warm the bytecode cache
+    return statistics.median(run_once(code) for _ in range(runs))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=150.0)
+    parser.add_argument('--runs', type=int, default=15)
+    args = parser.parse_args()
+    bare = median_time('pass', args.runs)
+    total = median_time('import chempy', args.runs)
+    cost_ms = (total - bare) * 1e3
+    print(f'python startup: {bare * 1e3:.1f} ms, import chempy: +{cost_ms:.1f} ms (budget {args.budget_ms:.0f} ms)')
+    if cost_ms > args.budget_ms:
+        print('FAIL: import chempy exceeded its startup budget', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
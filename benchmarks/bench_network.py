@@ -0,0 +1,56 @@
+"""
+Integration of a large mass-action network with `chempy.network`.
+
+The network is a chain of alkane growth steps, `CnH2n+2 + CH4 -> Cn+1H2n+4 + H2`,
+and their reverse reactions. The trajectory is streamed in chunks and only the
+final state is kept.
+
+Run from the repository root:
+
+    python benchmarks/bench_network.py [--length N] [--points N] [--solver scipy|builtin]
+"""
+from chempy import Equation
+from chempy.network import ReactionNetwork
+import argparse
+import numpy as np
+import time
+
+
+def alkane(n: int) -> str:
+    return f'C{n}H{2 * n + 2}' if n > 1 else 'CH4'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--length', type=int, default=500)
+    parser.add_argument('--points', type=int, default=2_000)
+    parser.add_argument('--chunksize', type=int, default=256)
+    parser.add_argument('--solver', choices=['scipy', 'builtin'], default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    reactions = []
+    for n in range(1, args.length):
+        forward = Equation.parse_from_string(f'{alkane(n)} + CH4 -> {alkane(n + 1)} + H2')
+        reverse = Equation.parse_from_string(f'{alkane(n + 1)} + H2 -> {alkane(n)} + CH4')
+        reactions += [(forward, 1.0), (reverse, 1e-2)]
+    network = ReactionNetwork(reactions)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunks = 0
+    for chunk in network.simulate({'CH4': 1.0}, np.linspace(0, 100, args.points),
+                                  chunksize=args.chunksize, solver=args.solver):
+        chunks += 1
+        final = chunk.concentrations[-1]
+    simulate_time = time.perf_counter() - start
+
+    carbon = sum(n * final[network.species.index(alkane(n))] for n in range(1, args.length))
+    print(f'{network!r}')
+    print(f'compile                    {build_time * 1e3:10.1f} ms')
+    print(f'simulate ({chunks} chunks)     {simulate_time * 1e3:10.1f} ms')
+    print(f'carbon balance             {carbon:10.6f}')
+
+
+if __name__ == '__main__':
+    main()
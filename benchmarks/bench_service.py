@@ -0,0 +1,125 @@
+"""
+Load test of the asyncio balancing server (`python -m chempy serve`).
+
+Starts a server in a subprocess (or targets `--url`), then keeps `--concurrency`
+keep-alive connections busy until `--requests` requests have been answered.
+Reactions are drawn from a small pool, so concurrent duplicates exercise
+request coalescing. Reports throughput, latency percentiles and the server's
+`/stats` counters.
+
+Run from the repository root:
+
+    python benchmarks/bench_service.py [--requests N] [--concurrency N] [--workers N] [--url http://host:port]
+"""
+from urllib.parse import quote, urlsplit
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+REACTIONS = [
+    'C3H8 + O2 -> CO2 + H2O',
+    'KMnO4 + HCl -> KCl + MnCl2 + H2O + Cl2',
+    'K4Fe(CN)6 + KMnO4 + H2SO4 -> KHSO4 + Fe2(SO4)3 + MnSO4 + HNO3 + CO2 + H2O',
+    'Fe2O3 + CO -> Fe + CO2',
+    'Cu + HNO3 -> Cu(NO3)2 + NO + H2O',
+] + [f'C{n}H{2 * n + 2} + O2 -> CO2 + H2O' for n in range(1, 40)]
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str, path: str) -> dict:
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n'.encode())
+    await writer.drain()
+    status = await reader.readline()
+    length = 0
+    while (header := await reader.readline()) not in (b'\r\n', b''):
+        name, _, value = header.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    if not status.startswith(b'HTTP/1.1 200'):
+        raise RuntimeError(f'Unexpected response: {status!r}')
+    return json.loads(await reader.readexactly(length))
+
+
+async def client(host: str, port: int, jobs: asyncio.Queue, latencies: list[float], errors: list[str]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while not jobs.empty():
+            reaction = jobs.get_nowait()
+            start = time.perf_counter()
+            record = await request(reader, writer, host, f'/balance?reaction={quote(reaction)}')
+            latencies.append(time.perf_counter() - start)
+            if record['status'] != 'ok':
+                errors.append(record['error'])
+    finally:
+        writer.close()
+
+
+async def load(host: str, port: int, total: int, concurrency: int, seed: int) -> None:
+    rng = random.Random(seed)
+    jobs: asyncio.Queue = asyncio.Queue()
+    for _ in range(total):
+        jobs.put_nowait(rng.choice(REACTIONS))
+    latencies: list[float] = []
+    errors: list[str] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, jobs, latencies, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    reader, writer = await asyncio.open_connection(host, port)
+    stats = await request(reader, writer, host, '/stats')
+    writer.close()
+
+    latencies.sort()
+    percentile = lambda fraction: latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1e3
+    print(f'requests: {len(latencies):,} in {elapsed:.2f} s ({len(latencies) / elapsed:,.0f} req/s), '
+          f'concurrency {concurrency}, errors {len(errors)}')
+    print(f'latency ms: mean {statistics.fmean(latencies) * 1e3:.2f}  p50 {percentile(0.5):.2f}  '
+          f'p90 {percentile(0.9):.2f}  p99 {percentile(0.99):.2f}  max {latencies[-1] * 1e3:.2f}')
+    print(f'server: {stats}')
+
+
+def start_server(workers: int, max_in_flight: int) -> tuple[subprocess.Popen, str, int]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    process = subprocess.Popen([sys.executable, '-m', 'chempy', 'serve', '--port', '0', '--workers', str(workers),
+                                '--max-in-flight', str(max_in_flight)],
+                               env=env, cwd=ROOT, stderr=subprocess.PIPE, text=True)
+    url = urlsplit(process.stderr.readline().split()[-1])
+    # Keep forwarding the server's stderr so that it never blocks writing to a full pipe.
+    threading.Thread(target=shutil.copyfileobj, args=(process.stderr, sys.stderr), daemon=True).start()
+    return process, url.hostname, url.port
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=5_000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=1, help='server worker processes (ignored with --url)')
+    parser.add_argument('--max-in-flight', type=int, default=32, help='server in-flight limit (ignored with --url)')
+    parser.add_argument('--url', help='target a running server instead of starting one')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    process = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port
+    else:
+        process, host, port = start_server(args.workers, args.max_in_flight)
+    try:
+        asyncio.run(load(host, port, args.requests, args.concurrency, args.seed))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmark suite for the parse, balance, Hess's law and rendering hot paths.
+
+Every case is timed with `timeit` (best and median of several repeats, in
+microseconds per call) and then run once more under `tracemalloc` to record its
+peak allocation. Cases marked "cold" clear `PARSE_CACHE` and `RENDER_CACHE`
+before every call, so they measure the work the caches normally save. Results
+can be stored as a JSON baseline and later runs compared against it:
+
+    python benchmarks/suite.py --save baseline.json
+    python benchmarks/suite.py --compare baseline.json [--threshold 1.25]
+
+`--compare` exits with status 1 if any case is slower than `threshold` times
+its baseline. `--filter SUBSTRING` runs a subset and `--quick` fewer repeats.
+"""
+from bench_import import median_time
+from chempy import Compound, Element, Equation, Equation2, PARSE_CACHE
+from chempy.hess_law import Hess_Law
+from chempy.render import RENDER_CACHE
+from chempy.utils import tokenize
+from collections.abc import Callable
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+import tracemalloc
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+FORMULAS = {
+    'small': 'H2O',
+    'nested': 'K[(MnO4)15]2',
+    'polymer': '[(C2H4)1000]50',
+    'long': '(CH2)2' * 200,
+}
+
+EQUATIONS = {
+    'small': 'C3H8 + O2 -> CO2 + H2O',
+    'redox': 'KMnO4 + HCl -> KCl + MnCl2 + H2O + Cl2',
+    'nested': 'K4Fe(CN)6 + K[(MnO4)15]2 + H2SO4 -> KHSO4 + Fe2(SO4)3 + MnSO4 + HNO3 + CO2 + H2O',
+}
+
+
+def cold(func: Callable[[], object]) -> Callable[[], object]:
+    def run() -> object:
+        PARSE_CACHE.clear()
+        RENDER_CACHE.clear()
+        return func()
+    return run
+
+
+def hess_law() -> Hess_Law:
+    return Hess_Law(
+        (Equation.parse_from_string('C + O2 -> CO2'), -393.5),
+        [(Equation.parse_from_string('H2 + O2 -> H2O'), -571.6),
+         (Equation.parse_from_string('CH4 + O2 -> CO2 + H2O'), -890.3)],
+        Equation.parse_from_string('C + H2 -> CH4'))
+
+
+def balanced_equation(line: str) -> Equation:
+    equation = Equation.parse_from_string(line)
+    equation.balance()
+    return equation
+
+
+def cases() -> dict[str, Callable[[], object]]:
+    """Returns every benchmark case by name. Balancing cases include parsing, since `balance` is a no-op once balanced."""
+    suite: dict[str, Callable[[], object]] = {}
+    for size, formula in FORMULAS.items():
+        suite[f'tokenize/{size}'] = lambda formula=formula: tokenize(formula)
+        suite[f'Compound/{size}'] = lambda formula=formula: Compound(formula)
+        suite[f'Compound/{size}/cold'] = cold(lambda formula=formula: Compound(formula))
+        compound = Compound(formula)
+        suite[f'latexify/{size}'] = compound.latexify
+        suite[f'latexify/{size}/cold'] = cold(compound.latexify)
+    for symbol in ('H', 'Fe', 'Og'):
+        suite[f'Element/{symbol}'] = lambda symbol=symbol: Element(symbol)
+    for size, line in EQUATIONS.items():
+        suite[f'Equation.balance/{size}'] = lambda line=line: balanced_equation(line)
+        suite[f'Equation2.balance/{size}'] = lambda line=line: Equation2(line).balance()
+        equation = balanced_equation(line)
+        suite[f'Equation.render/{size}'] = lambda equation=equation: equation.render('latex')
+    suite['Hess_Law/methane'] = hess_law
+    return suite
+
+
+def time_case(func: Callable[[], object], repeat: int) -> dict[str, float]:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    samples = [elapsed / number for elapsed in timer.repeat(repeat=repeat, number=number)]
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'best_us': min(samples) * 1e6, 'median_us': statistics.median(samples) * 1e6,
+            'calls': number * repeat, 'peak_bytes': peak}
+
+
+def time_import(runs: int) -> dict[str, float]:
+    bare = median_time('pass', runs)
+    total = median_time('import chempy', runs)
+    return {'best_us': (total - bare) * 1e6, 'median_us': (total - bare) * 1e6, 'calls': runs, 'peak_bytes': None}
+
+
+def metadata() -> dict[str, str]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'platform': platform.platform(),
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')}
+
+
+def format_bytes(size) -> str:
+    if size is None:
+        return '-'
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024:
+            return f'{size:.0f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GiB'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--save', metavar='PATH', help='write the results to a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='compare against a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio reported as a regression')
+    parser.add_argument('--filter', default='', help='only run cases whose name contains this')
+    parser.add_argument('--quick', action='store_true', help='fewer repeats')
+    args = parser.parse_args()
+    repeat = 3 if args.quick else 7
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)['results']
+
+    results: dict[str, dict[str, float]] = {}
+    selected = {name: func for name, func in cases().items() if args.filter in name}
+    if args.filter in 'import chempy':
+        selected['import chempy'] = None
+    regressions: list[str] = []
+    header = f'{"case":<32}{"best (us)":>12}{"median (us)":>13}{"peak":>11}'
+    print(header + (f'{"baseline":>12}{"ratio":>8}' if baseline else ''))
+    for name, func in selected.items():
+        result = time_import(5 if args.quick else 15) if func is None else time_case(func, repeat)
+        results[name] = result
+        line = f'{name:<32}{result["best_us"]:>12.1f}{result["median_us"]:>13.1f}{format_bytes(result["peak_bytes"]):>11}'
+        if baseline:
+            previous = baseline.get(name)
+            if previous is None:
+                line += f'{"-":>12}{"new":>8}'
+            else:
+                ratio = result['best_us'] / previous['best_us']
+                line += f'{previous["best_us"]:>12.1f}{ratio:>7.2f}x'
+                if ratio > args.threshold:
+                    line += '  REGRESSION'
+                    regressions.append(name)
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({'meta': metadata(), 'results': results}, file, indent=2)
+        print(f'saved {len(results)} results to {args.save}')
+    if regressions:
+        print(f'{len(regressions)} case(s) slower than {args.threshold}x baseline: {", ".join(regressions)}',
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,26 +1,44 @@
 from .element import Element
-from .compound import Compound
+from .composition import Composition
+from .compound import Compound, PARSE_CACHE, merge_duplicate_compounds
 from .equation import Equation
 from .compound_counter import CompoundCounter
 from .equation2 import Equation2
 from .subscript import Subscript
+from .reaction_library import ReactionLibrary
+from .reaction_cache import ReactionCache
+from .hess_law import solve_hess, HessSolution
+from .batch import balance_many, balance_line, BalanceResult
+from .profiling import Profiler
+from .utils import BalanceError, ImpossibleEquationError, UnderdeterminedEquationError
 from .data import (
     LEFT_DELIMS, 
     RIGHT_DELIMS, 
     ALL_DELIMS, 
-    ELEMENTS_PATH, 
-    ELEMENT_ITEMS, 
-    ELEMENT_PROTON_DATA, 
-    ELEMENTS
+    ELEMENTS_PATH
 )
 
 __all__ = [
     'Element', 
+    'Composition',
     'Compound', 
+    'PARSE_CACHE',
+    'merge_duplicate_compounds',
     'Equation',
     'CompoundCounter',
     'Equation2',
     'Subscript',
+    'ReactionLibrary',
+    'ReactionCache',
+    'solve_hess',
+    'HessSolution',
+    'balance_many',
+    'balance_line',
+    'BalanceResult',
+    'Profiler',
+    'BalanceError',
+    'ImpossibleEquationError',
+    'UnderdeterminedEquationError',
     'LEFT_DELIMS', 
     'RIGHT_DELIMS', 
     'ALL_DELIMS', 
@@ -28,4 +46,12 @@ __all__ = [
     'ELEMENT_ITEMS', 
     'ELEMENT_PROTON_DATA', 
     'ELEMENTS'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    """Loads the element tables on first access so that `import chempy` stays cheap."""
+    if name in ('ELEMENT_ITEMS', 'ELEMENT_PROTON_DATA', 'ELEMENTS'):
+        from . import data
+        return getattr(data, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,203 @@
+"""
+Balancing from asyncio code.
+
+`BalanceService.balance` (and the module-level `abalance`) runs `balance_line`
+in an executor so the event loop never blocks on the solver. Identical
+requests that arrive while one is being computed share its result instead of
+queueing again, and a semaphore bounds how many computations are in flight.
+
+`serve` runs a small HTTP/1.1 front end on top of a service, as a local
+stand-in for a balancing API (see `python -m chempy serve`):
+
+    GET  /balance?reaction=H2+%2B+O2+-%3E+H2O
+    POST /balance            (body: the reaction, as text or {"reaction": ...})
+    GET  /stats
+
+    >>> import asyncio
+    >>> asyncio.run(abalance('H2 + O2 -> H2O')).coefficients
+    [2, 1, 2]
+"""
+from .batch import BalanceResult, balance_line, to_record
+from concurrent.futures import Executor
+from typing import NamedTuple, Optional
+from urllib.parse import parse_qs, urlsplit
+import asyncio
+import json
+import weakref
+
+
+class ServiceStats(NamedTuple):
+    """Requests received, requests answered by joining an identical in-flight computation, and computations run."""
+    requests: int
+    coalesced: int
+    computed: int
+    in_flight: int
+
+
+def request_key(line: str) -> str:
+    """Returns the key under which identical requests are coalesced: the reaction with its whitespace normalized."""
+    return ' '.join(line.split())
+
+
+class BalanceService:
+    """
+    Balances reactions in `executor` (the event loop's default executor if `None`).
+
+    At most `max_in_flight` computations run at once; further distinct requests wait
+    for a slot. Pass a `ProcessPoolExecutor` to balance on several cores.
+    """
+    def __init__(self, executor: Optional[Executor] = None, max_in_flight: int = 32) -> None:
+        if not isinstance(max_in_flight, int) or max_in_flight < 1:
+            raise ValueError(f'Expected a positive `int` for `max_in_flight` argument but received `{max_in_flight!r}` instead.')
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._pending: dict[str, asyncio.Future[BalanceResult]] = {}
+        self._requests = 0
+        self._coalesced = 0
+        self._computed = 0
+
+    async def _compute(self, key: str) -> BalanceResult:
+        async with self._semaphore:
+            self._computed += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, balance_line, key)
+
+    async def balance(self, line: str) -> BalanceResult:
+        """Returns the `BalanceResult` of `line`, joining an identical request already in flight if there is one."""
+        if not isinstance(line, str):
+            raise TypeError(f'Expected `str` for `line` argument but received `{line.__class__.__name__}` instead.')
+        self._requests += 1
+        key = request_key(line)
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        else:
+            self._coalesced += 1
+        # Shielded so that a cancelled caller does not cancel the computation other callers share.
+        return await asyncio.shield(task)
+
+    def stats(self) -> ServiceStats:
+        return ServiceStats(self._requests, self._coalesced, self._computed, len(self._pending))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(max_in_flight={self.max_in_flight})'
+
+
+_services: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, BalanceService] = weakref.WeakKeyDictionary()
+
+
+def default_service() -> BalanceService:
+    """Returns the `BalanceService` of the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    service = _services.get(loop)
+    if service is None:
+        service = _services[loop] = BalanceService()
+    return service
+
+
+async def abalance(line: str) -> BalanceResult:
+    """Balances `line` without blocking the event loop (see `BalanceService.balance`)."""
+    return await default_service().balance(line)
+
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+           500: 'Internal Server Error'}
+MAX_BODY = 64 * 1024
+
+
+async def _respond(writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool) -> None:
+    body = json.dumps(payload).encode()
+    writer.write(f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+                 'Content-Type: application/json\r\n'
+                 f'Content-Length: {len(body)}\r\n'
+                 f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode() + body)
+    await writer.drain()
+
+
+def _content_length(headers: dict[str, str]) -> Optional[int]:
+    """Returns the declared body length (0 if absent), or `None` if the header is not a non-negative integer."""
+    value = headers.get('content-length', '0')
+    return int(value) if value.isascii() and value.isdigit() else None
+
+
+async def _reaction_from_request(method: str, target: str, headers: dict[str, str], length: int,
+                                 reader: asyncio.StreamReader) -> tuple[int, Optional[str]]:
+    """Returns the status to answer with and, if the request is valid, the reaction it asks for."""
+    url = urlsplit(target)
+    if url.path != '/balance':
+        return 404, None
+    if method == 'GET':
+        reactions = parse_qs(url.query).get('reaction')
+        return (200, reactions[0]) if reactions else (400, None)
+    if method != 'POST':
+        return 405, None
+    if length > MAX_BODY:
+        return 413, None
+    try:
+        body = (await reader.readexactly(length)).decode('utf-8')
+    except UnicodeDecodeError:
+        return 400, None
+    if headers.get('content-type', '').startswith('application/json'):
+        try:
+            body = json.loads(body)['reaction']
+        except (ValueError, KeyError, TypeError):
+            return 400, None
+    return (200, body) if isinstance(body, str) and body.strip() else (400, None)
+
+
+async def _handle(service: BalanceService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while request_line := await reader.readline():
+            try:
+                method, target, version = request_line.decode('latin-1').split()
+            except ValueError:
+                await _respond(writer, 400, {'error': REASONS[400]}, False)
+                break
+            headers: dict[str, str] = {}
+            while (header := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                name, _, value = header.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+            length = _content_length(headers)
+            if length is None:
+                # The body cannot be delimited, so the connection cannot be reused.
+                await _respond(writer, 400, {'error': REASONS[400]}, False)
+                break
+            if method == 'GET' and urlsplit(target).path == '/stats':
+                await _respond(writer, 200, service.stats()._asdict(), keep_alive)
+            else:
+                status, reaction = await _reaction_from_request(method, target, headers, length, reader)
+                if reaction is None:
+                    # An oversized body is left unread, so the connection cannot be reused.
+                    keep_alive = keep_alive and status != 413
+                    await _respond(writer, status, {'error': REASONS[status]}, keep_alive)
+                else:
+                    try:
+                        result = await service.balance(reaction)
+                    except Exception as error:
+                        # e.g. a `BrokenProcessPool`; balancing errors themselves are reported in the result.
+                        await _respond(writer, 500, {'error': f'{error.__class__.__name__}: {error}'}, keep_alive)
+                    else:
+                        await _respond(writer, 200, to_record(result), keep_alive)
+            if not keep_alive:
+                break
+    except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(service: Optional[BalanceService] = None, host: str = '127.0.0.1', port: int = 8080) -> asyncio.Server:
+    """Starts the HTTP front end of `service` (a new `BalanceService` if `None`) and returns the listening server."""
+    service = service or BalanceService()
+    return await asyncio.start_server(lambda reader, writer: _handle(service, reader, writer), host, port)
+
+
+async def serve(service: Optional[BalanceService] = None, host: str = '127.0.0.1', port: int = 8080) -> None:
+    """Serves `service` over HTTP until cancelled."""
+    server = await start_server(service, host, port)
+    async with server:
+        await server.serve_forever()
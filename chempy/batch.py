@@ -0,0 +1,117 @@
+from .equation import Equation
+from collections import deque
+from collections.abc import Iterable, Iterator
+from itertools import islice
+import os
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from .reaction_cache import ReactionCache
+
+
+class BalanceResult(NamedTuple):
+    """The outcome of balancing one reaction string. Exactly one of `coefficients` and `error` is set."""
+    index: int
+    line: str
+    coefficients: Optional[list[int | float]]
+    equation: Optional[str]
+    latex: Optional[str]
+    error: Optional[str]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def to_record(result: BalanceResult) -> dict:
+    """Returns `result` as the flat record written by `python -m chempy balance` and served by `chempy.aio`."""
+    return {
+        'index': result.index,
+        'input': result.line,
+        'status': 'ok' if result.ok else 'error',
+        'coefficients': result.coefficients,
+        'balanced': result.equation,
+        'latex': result.latex,
+        'error': result.error,
+    }
+
+
+def balance_line(line: str, index: int = 0, cache: Optional['ReactionCache'] = None) -> BalanceResult:
+    """
+    Parses and balances `line`, reporting any failure in the result instead of raising or printing.
+
+    With a `cache`, coefficients stored for the same reaction are applied without running the solver.
+    """
+    try:
+        equation = Equation.parse_from_string(line)
+        if cache is None:
+            equation.balance(strict=True)
+        else:
+            cache.balance(equation, strict=True)
+    except Exception as error:
+        return BalanceResult(index, line, None, None, None, f'{error.__class__.__name__}: {error}')
+    return BalanceResult(
+        index=index,
+        line=line,
+        coefficients=[compound.coefficient for compound in equation.compounds],
+        equation=str(equation),
+        latex=equation._repr_latex_(),
+        error=None,
+    )
+
+
+def _balance_chunk(chunk: list[tuple[int, str]], cache: Optional['ReactionCache'] = None) -> list[BalanceResult]:
+    return [balance_line(line, index, cache) for index, line in chunk]
+
+
+def _chunked(lines: Iterable[str], chunksize: int) -> Iterator[list[tuple[int, str]]]:
+    numbered = enumerate(lines)
+    while chunk := list(islice(numbered, chunksize)):
+        yield chunk
+
+
+def balance_many(lines: Iterable[str],
+                 workers: Optional[int] = None,
+                 chunksize: int = 64,
+                 ordered: bool = True,
+                 max_pending: Optional[int] = None,
+                 cache: Optional['ReactionCache'] = None) -> Iterator[BalanceResult]:
+    """
+    Balances every reaction string in `lines`, yielding one `BalanceResult` per line.
+
+    `lines` is consumed lazily in chunks of `chunksize`, and at most `max_pending`
+    chunks (default: twice the number of workers) are in flight at once, so
+    arbitrarily long inputs run in constant memory. `workers` defaults to the CPU
+    count; `workers=1` balances in the calling process. Results come back in input
+    order, or as soon as each chunk finishes when `ordered=False` (use
+    `BalanceResult.index` to match them up). With a `cache`, reactions already in it
+    are not solved again and newly balanced ones are added; each worker process opens
+    its own connection to it.
+    """
+    from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+    if chunksize < 1:
+        raise ValueError(f'Expected a positive `chunksize` but received `{chunksize}` instead.')
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunked(lines, chunksize)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _balance_chunk(chunk, cache)
+        return
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if ordered:
+            queue: deque[Future] = deque(
+                executor.submit(_balance_chunk, chunk, cache) for chunk in islice(chunks, max_pending))
+            while queue:
+                results = queue.popleft().result()
+                for chunk in islice(chunks, 1):
+                    queue.append(executor.submit(_balance_chunk, chunk, cache))
+                yield from results
+            return
+        pending: set[Future] = {executor.submit(_balance_chunk, chunk, cache) for chunk in islice(chunks, max_pending)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for chunk in islice(chunks, len(done)):
+                pending.add(executor.submit(_balance_chunk, chunk, cache))
+            for future in done:
+                yield from future.result()
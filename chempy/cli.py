@@ -0,0 +1,129 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from typing import Optional, TextIO
+from .batch import BalanceResult, balance_many, to_record
+
+
+FIELDS = ['index', 'input', 'status', 'coefficients', 'balanced', 'latex', 'error']
+
+
+def read_reactions(stream: TextIO) -> Iterator[str]:
+    """Yields each reaction in `stream`, skipping blank lines and `#` comments, without reading ahead."""
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+
+def write_jsonl(results: Iterable[BalanceResult], output: TextIO) -> tuple[int, int]:
+    ok = failed = 0
+    for result in results:
+        output.write(json.dumps(to_record(result)) + '\n')
+        ok, failed = (ok + 1, failed) if result.ok else (ok, failed + 1)
+    return ok, failed
+
+
+def write_csv(results: Iterable[BalanceResult], output: TextIO) -> tuple[int, int]:
+    writer = csv.DictWriter(output, fieldnames=FIELDS)
+    writer.writeheader()
+    ok = failed = 0
+    for result in results:
+        record = to_record(result)
+        if record['coefficients'] is not None:
+            record['coefficients'] = ' '.join(str(coef) for coef in record['coefficients'])
+        writer.writerow(record)
+        ok, failed = (ok + 1, failed) if result.ok else (ok, failed + 1)
+    return ok, failed
+
+
+def balance_command(args: argparse.Namespace) -> int:
+    source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    cache = None
+    if args.cache:
+        from .reaction_cache import ReactionCache
+        cache = ReactionCache(args.cache, max_entries=args.cache_size or None)
+    try:
+        results = balance_many(read_reactions(source), workers=args.workers, chunksize=args.chunksize,
+                               ordered=not args.unordered, cache=cache)
+        write = write_csv if args.format == 'csv' else write_jsonl
+        ok, failed = write(results, output)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    if not args.quiet:
+        print(f'balanced {ok}, failed {failed}', file=sys.stderr)
+    return 1 if failed else 0
+
+
+def serve_command(args: argparse.Namespace) -> int:
+    import asyncio
+    from .aio import BalanceService, start_server
+
+    async def run() -> None:
+        executor = None
+        if args.workers != 1:
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=args.workers or None)
+        try:
+            server = await start_server(BalanceService(executor, args.max_in_flight), args.host, args.port)
+            if not args.quiet:
+                host, port = server.sockets[0].getsockname()[:2]
+                print(f'serving on http://{host}:{port}/balance', file=sys.stderr)
+            async with server:
+                await server.serve_forever()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m chempy')
+    commands = parser.add_subparsers(dest='command', required=True)
+    balance = commands.add_parser('balance', help='balance reactions read line by line',
+                                  description='Balance reactions read line by line. '
+                                              'Exits with status 1 if any reaction could not be balanced.')
+    balance.add_argument('input', nargs='?', default='-', help='file of reactions, one per line (default: stdin)')
+    balance.add_argument('-o', '--output', default='-', help='where to write results (default: stdout)')
+    balance.add_argument('-f', '--format', choices=['jsonl', 'csv'], default='jsonl')
+    balance.add_argument('-j', '--workers', type=int, default=1,
+                         help='worker processes; 0 uses every CPU (default: 1)')
+    balance.add_argument('--chunksize', type=int, default=64, help='reactions sent to a worker at a time')
+    balance.add_argument('--unordered', action='store_true', help='write results as they complete')
+    balance.add_argument('--cache', metavar='PATH',
+                         help='SQLite file of balanced reactions to reuse and extend across runs')
+    balance.add_argument('--cache-size', type=int, default=100_000,
+                         help='reactions kept in the cache, least recently used evicted first; 0 for no limit')
+    balance.add_argument('-q', '--quiet', action='store_true', help='do not print the summary to stderr')
+    balance.set_defaults(handler=balance_command)
+    serve = commands.add_parser('serve', help='serve balancing over HTTP (GET/POST /balance, GET /stats)')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8080)
+    serve.add_argument('-j', '--workers', type=int, default=1,
+                       help='worker processes; 1 balances in a thread of the server, 0 uses every CPU (default: 1)')
+    serve.add_argument('--max-in-flight', type=int, default=32, help='reactions balanced at once')
+    serve.add_argument('-q', '--quiet', action='store_true', help='do not print the address to stderr')
+    serve.set_defaults(handler=serve_command)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); stop quietly instead of printing a traceback at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
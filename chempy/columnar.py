@@ -0,0 +1,130 @@
+"""
+Columnar, NumPy-backed formula properties.
+
+`composition_matrix` parses many formulas at once into a sparse CSR matrix of
+shape `(formulas, elements)`; molar masses, electron counts and valence totals
+are then a single sparse matrix-vector product against per-element property
+vectors read straight from the periodic table snapshot.
+
+    >>> from chempy.columnar import molar_masses
+    >>> molar_masses(['H2O', 'CO2', 'C6H12O6'])
+    array([ 18.016,  44.01 , 180.156])
+"""
+from .compound import parse_compound
+from .data import periodic_table
+from .utils import strip_coefficients
+from collections.abc import Iterable
+from functools import cache
+from typing import NamedTuple
+import numpy as np
+
+
+class CompositionMatrix(NamedTuple):
+    """
+    Element counts of many formulas in CSR form.
+
+    Row `i` holds formula `i`; column `z - 1` holds the count of the element with
+    atomic number `z`. `charges` is the net charge of every formula.
+    """
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    charges: np.ndarray
+    columns: int
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (len(self.indptr) - 1, self.columns)
+
+    def _rows(self) -> np.ndarray:
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def dot(self, vector: np.ndarray) -> np.ndarray:
+        """Returns the matrix-vector product with a per-element `vector` of length `columns`."""
+        vector = np.asarray(vector)
+        if vector.shape != (self.columns,):
+            raise ValueError(f'Expected a vector of shape ({self.columns},) but received {vector.shape} instead.')
+        return np.bincount(self._rows(), weights=self.data * vector[self.indices], minlength=self.shape[0])
+
+    def toarray(self) -> np.ndarray:
+        """Returns the dense `(formulas, elements)` count matrix."""
+        dense = np.zeros(self.shape, dtype=self.data.dtype)
+        dense[self._rows(), self.indices] = self.data
+        return dense
+
+    def to_scipy(self):
+        """Returns the counts as a `scipy.sparse.csr_matrix` (requires scipy)."""
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+
+
+class AtomicProperties(NamedTuple):
+    """Per-element property vectors indexed by `atomic number - 1`."""
+    molar_mass: np.ndarray
+    protons: np.ndarray
+    valence_electrons: np.ndarray
+
+
+@cache
+def atomic_properties() -> AtomicProperties:
+    """Returns the per-element property vectors, viewing the memory-mapped periodic table without copying where possible."""
+    table = periodic_table()
+    molar_mass = np.frombuffer(table.molar_masses, dtype=np.float64)
+    molar_mass.flags.writeable = False
+    protons = np.arange(1, table.count + 1, dtype=np.int64)
+    protons.flags.writeable = False
+    valence = np.frombuffer(table.valence_electrons, dtype=np.uint8).astype(np.int64)
+    valence.flags.writeable = False
+    return AtomicProperties(molar_mass, protons, valence)
+
+
+def composition_matrix(formulas: Iterable[str]) -> CompositionMatrix:
+    """
+    Parses every formula in `formulas` (any iterable of strings, including NumPy string arrays) into a `CompositionMatrix`.
+
+    Leading coefficients are ignored, so each row describes one formula unit.
+    Repeated formulas are parsed once per call and the parses are shared with
+    `Compound` through `PARSE_CACHE`.
+    """
+    seen: dict[str, tuple[list[int], list[int], int]] = {}
+    indptr, indices, data, charges = [0], [], [], []
+    for formula in formulas:
+        formula = str(formula)
+        entry = seen.get(formula)
+        if entry is None:
+            parsed = parse_compound(strip_coefficients(formula))
+            ordered = [(element.protons - 1, count) for element, count in parsed.composition.counts]
+            entry = ([column for column, _ in ordered], [count for _, count in ordered], parsed.charge)
+            seen[formula] = entry
+        columns, counts, charge = entry
+        indices.extend(columns)
+        data.extend(counts)
+        charges.append(charge)
+        indptr.append(len(indices))
+    return CompositionMatrix(
+        indptr=np.array(indptr, dtype=np.int64),
+        indices=np.array(indices, dtype=np.int32),
+        data=np.array(data, dtype=np.int64),
+        charges=np.array(charges, dtype=np.int64),
+        columns=periodic_table().count,
+    )
+
+
+def _as_matrix(formulas: Iterable[str] | CompositionMatrix) -> CompositionMatrix:
+    return formulas if isinstance(formulas, CompositionMatrix) else composition_matrix(formulas)
+
+
+def molar_masses(formulas: Iterable[str] | CompositionMatrix) -> np.ndarray:
+    """Returns the molar mass (g/mol) of every formula as a float64 array."""
+    return _as_matrix(formulas).dot(atomic_properties().molar_mass)
+
+
+def electron_counts(formulas: Iterable[str] | CompositionMatrix) -> np.ndarray:
+    """Returns the total electrons of every formula, less its charge, as an int64 array."""
+    matrix = _as_matrix(formulas)
+    return matrix.dot(atomic_properties().protons).astype(np.int64) - matrix.charges
+
+
+def valence_electron_totals(formulas: Iterable[str] | CompositionMatrix) -> np.ndarray:
+    """Returns the summed valence electrons of every formula as an int64 array."""
+    return _as_matrix(formulas).dot(atomic_properties().valence_electrons).astype(np.int64)
@@ -0,0 +1,106 @@
+from collections.abc import Iterable, Iterator, Mapping
+from .element import Element
+from typing import Optional, Self
+
+
+class Composition(Mapping):
+    """
+    The immutable element counts and net charge of a chemical species.
+
+    Elements are stored once, ordered by atomic number, so two compositions with the
+    same counts compare and hash equal however their formulas were written. The
+    hash is computed once on construction. Looking up an absent element returns 0,
+    as with `Counter`.
+    """
+    __slots__ = ('counts', 'charge', '_lookup', '_hash', '_formula')
+
+    def __init__(self, counts: Mapping[Element, int] | Iterable[tuple[Element, int]] = (),
+                 charge: int = 0) -> None:
+        if isinstance(counts, Mapping):
+            counts = counts.items()
+        totals: dict[Element, int] = {}
+        for element, count in counts:
+            if not isinstance(element, Element):
+                raise TypeError('Expected `Element` keys for `counts` argument but received '
+                                f'`{element.__class__.__name__}` instead.')
+            totals[element] = totals.get(element, 0) + count
+        items = tuple(sorted(((element, count) for element, count in totals.items() if count),
+                             key=lambda item: item[0].protons))
+        object.__setattr__(self, 'counts', items)
+        object.__setattr__(self, 'charge', charge)
+        object.__setattr__(self, '_lookup', dict(items))
+        object.__setattr__(self, '_hash', hash((items, charge)))
+        object.__setattr__(self, '_formula', None)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f'`{self.__class__.__name__}` is immutable; cannot set `{name}`.')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'`{self.__class__.__name__}` is immutable; cannot delete `{name}`.')
+
+    def __reduce__(self):
+        return (self.__class__, (self.counts, self.charge))
+
+    def __getitem__(self, element: Element) -> int:
+        return self._lookup.get(element, 0)
+
+    def __contains__(self, element: object) -> bool:
+        return element in self._lookup
+
+    def __iter__(self) -> Iterator[Element]:
+        return iter(self._lookup)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, Composition):
+            return self._hash == other._hash and self.counts == other.counts and self.charge == other.charge
+        if isinstance(other, Mapping):
+            return self.charge == 0 and self._lookup == {k: v for k, v in other.items() if v}
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        counts = ', '.join(f"'{element}': {count}" for element, count in self.counts)
+        charge = f', charge={self.charge}' if self.charge else ''
+        return f'{self.__class__.__name__}({{{counts}}}{charge})'
+
+    @property
+    def formula(self) -> str:
+        """
+        The canonical formula in Hill notation, e.g. `C2H4O2` or `O4S^2-`.
+
+        Carbon comes first and hydrogen second when carbon is present; every other
+        element (and hydrogen without carbon) follows alphabetically. Equal
+        compositions always produce the same formula, so it serves as a stable
+        string key, and it parses back to an equal `Composition`.
+        """
+        if self._formula is None:
+            symbols = {element.symbol: count for element, count in self.counts}
+            order = sorted(symbols)
+            if 'C' in symbols:
+                order = ['C'] + (['H'] if 'H' in symbols else []) + [s for s in order if s not in ('C', 'H')]
+            formula = ''.join(symbol if symbols[symbol] == 1 else f'{symbol}{symbols[symbol]}' for symbol in order)
+            if self.charge:
+                magnitude = abs(self.charge)
+                formula += f"^{magnitude if magnitude != 1 else ''}{'+' if self.charge > 0 else '-'}"
+            object.__setattr__(self, '_formula', formula)
+        return self._formula
+
+    def most_common(self, n: Optional[int] = None) -> list[tuple[Element, int]]:
+        """Returns the `(element, count)` pairs from most to least common, like `Counter.most_common`."""
+        ordered = sorted(self.counts, key=lambda item: item[1], reverse=True)
+        return ordered if n is None else ordered[:n]
+
+    def total(self) -> int:
+        """Returns the number of atoms."""
+        return sum(self._lookup.values())
+
+    def scaled(self, factor: int) -> Self:
+        """Returns the composition of `factor` formula units."""
+        return self.__class__(((element, count * factor) for element, count in self.counts), self.charge * factor)
@@ -1,11 +1,71 @@
-from .utils import tokenize, strip_coefficients, extract_coefficient
+from .utils import parse_formula, strip_coefficients, extract_coefficient, TokenView, LRUCache
 from collections import Counter
+from collections.abc import Iterable, Sequence
+from .composition import Composition
 from .element import Element
 from .subscript import Subscript
-from typing import Optional, Self
+from .render import formula_template, STYLES
+from typing import NamedTuple, Optional, Self
+
+
+class ParsedCompound(NamedTuple):
+    """The immutable result of parsing a normalized compound string, shared through `PARSE_CACHE`."""
+    composition: Composition
+    tokens: TokenView
+    subscripts: tuple[Subscript, ...]
+    charge: int
+    molar_mass: float
+    valence_electrons: int
+    electrons: int
+
+
+def _parse_compound(comp_str: str) -> ParsedCompound:
+    parsed = parse_formula(comp_str)
+    composition = Composition(parsed.counts, parsed.charge)
+    elements = composition.counts
+    return ParsedCompound(
+        composition=composition,
+        tokens=TokenView(parsed.runs),
+        subscripts=tuple(parsed.subscripts),
+        charge=parsed.charge,
+        molar_mass=sum(element.molar_mass * count for element, count in elements),
+        valence_electrons=sum(element.valence_electrons * count for element, count in elements),
+        electrons=sum(element.electrons * count for element, count in elements) - parsed.charge,
+    )
+
+
+PARSE_CACHE = LRUCache(maxsize=4096)
+
+
+def parse_compound(comp_str: str) -> ParsedCompound:
+    """Returns the parsed form of a normalized compound string (see `strip_coefficients`), served from `PARSE_CACHE` when possible."""
+    return PARSE_CACHE.get_or_create(comp_str, _parse_compound)
+
 
 class Compound:
-    def __init__(self, comp_str: str, tokens: Optional[list[Element]] = None,
+    """
+    A chemical species with a coefficient.
+
+    Identity (`==` and `hash`) is the species' `Composition` alone, so compounds with
+    the same elements and charge are interchangeable as dict and set keys whatever
+    their coefficient. Parsed data is shared between compounds of the same formula.
+    Instances are slotted, so they take no attributes beyond the ones below.
+    """
+    __slots__ = (
+        'comp_str',
+        'tokens',
+        'composition',
+        'subscripts',
+        'molar_mass',
+        'valence_electrons',
+        'electrons',
+        'coefficient',
+        'mass',
+        'moles',
+        '_elements',
+    )
+
+    def __init__(self, comp_str: str, tokens: Optional[Sequence[Element]] = None,
                  subscripts: Optional[list[Subscript]] = None,
                  mass: Optional[float] = None):
         if not isinstance(comp_str, str):
@@ -13,15 +73,22 @@ class Compound:
                             f'`{comp_str.__class__.__name__}` instead.')
         size, no_subs = extract_coefficient(comp_str.strip())
         comp_str = strip_coefficients(comp_str)
-        if tokens is None:
-            tokens, subscripts = tokenize(comp_str)
-        self.tokens = tokens
-        self.elements = Counter(tokens)
         self.comp_str = comp_str
-        self.subscripts: Optional[list[Subscript]] = subscripts
-        self.molar_mass = self._get_molar_mass()
-        self.valence_electrons = self._get_valence_electrons()
-        self.electrons = self._get_total_electrons()
+        if tokens is None:
+            parsed = parse_compound(comp_str)
+            self.tokens = parsed.tokens
+            self.composition = parsed.composition
+            self.subscripts: Optional[Sequence[Subscript]] = parsed.subscripts
+            self.molar_mass = parsed.molar_mass
+            self.valence_electrons = parsed.valence_electrons
+            self.electrons = parsed.electrons
+        else:
+            self.tokens = tokens
+            self.composition = Composition(Counter(tokens))
+            self.subscripts = subscripts
+            self.molar_mass = self._get_molar_mass()
+            self.valence_electrons = self._get_valence_electrons()
+            self.electrons = self._get_total_electrons()
         self.coefficient: int | float = 1
         if not no_subs:
             if size.is_integer():
@@ -30,9 +97,21 @@ class Compound:
                 self.coefficient = size
         self.mass = mass
         self.moles: Optional[float] = None
+        self._elements: Optional[Counter[Element]] = None
         if self.mass is not None:
             self.moles = self.mass / self.molar_mass
 
+    @property
+    def elements(self) -> Counter[Element]:
+        """The element counts of one formula unit, as a `Counter` built on first access. Use `composition` for the shared, read-only counts."""
+        if self._elements is None:
+            self._elements = Counter(self.composition)
+        return self._elements
+
+    @property
+    def charge(self) -> int:
+        return self.composition.charge
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}('{self.comp_str}')"
 
@@ -41,32 +120,42 @@ class Compound:
             return Compound(self.comp_str + other.symbol)
         elif isinstance(other, self.__class__):
             if self.comp_str == other.comp_str:
-                coef = self.coefficient + other.coefficient
-                return Compound(f'{coef}{self.comp_str}')
+                return self.with_coefficient(self.coefficient + other.coefficient)
             return Compound(self.comp_str + other.comp_str)
+
+    def with_coefficient(self, coefficient: int | float) -> Self:
+        """Returns a copy of the compound with `coefficient`, sharing its parsed data instead of re-parsing."""
+        compound = object.__new__(self.__class__)
+        for name in Compound.__slots__:
+            object.__setattr__(compound, name, getattr(self, name))
+        compound._elements = None
+        if isinstance(coefficient, float) and coefficient.is_integer():
+            coefficient = int(coefficient)
+        compound.coefficient = coefficient
+        return compound
         
     def __mul__(self, other: int):
         assert isinstance(other, int)
         return Compound(f'[{self.coefficient if self.coefficient != 1 else ''}{self.comp_str}]{other}')
 
     def _get_total_electrons(self) -> int:
-        """Returns the sum of the total electrons in the compound per number of elements. (Assigned to self.electrons)"""
+        """Returns the sum of the total electrons in the compound per number of elements, less its charge. (Assigned to self.electrons)"""
         return sum(element.electrons * count 
-                   for element, count in self.elements.items())
+                   for element, count in self.composition.items()) - self.charge
     
     def _get_molar_mass(self) -> float:
         """Returns the total molar mass of all the elements in the Compound. (Assigned to self.molar_mass)"""
         return sum(element.molar_mass  * count 
-                   for element, count in self.elements.items())
+                   for element, count in self.composition.items())
     
     def _get_valence_electrons(self) -> int:
         """Returns the sum of the valence electrons in the Compound (calculated using the QM model)."""
         return sum(element.valence_electrons * count 
-                   for element, count in self.elements.items())
+                   for element, count in self.composition.items())
 
     def count(self, element) -> int:
         """Returns the number of occurances an Element has in a compound."""
-        return sum(count for e, count in Counter(self.tokens).items() if e == element)
+        return self.composition[element]
 
     def subscript(self, index: int) -> Optional[int]:
         """Returns the count, or subscript of an element at a particular index in the compound string."""
@@ -83,23 +172,40 @@ class Compound:
 
     def latexify(self) -> str:
         """Returns a latex representation of the compound string."""
-        if self.subscripts == []:
+        if self.subscripts is not None and len(self.subscripts) == 0:
             return self.comp_str
-        latex_str = ''
-        for i, c in enumerate(self.comp_str):
-            if c.isdigit() or c == ' ' or c == '.':
-                continue
-            subs = self.subscript(i)
-            prefix = '\\text{'
-            if subs is None: # check delims to eliminate \text redundancy.
-                latex_str += prefix + c + '}'
-            else:
-                latex_str += prefix + c + '}' + '_{' + str(subs) + '}'
-        return latex_str
+        return formula_template(self.comp_str).latex
+
+    def render(self, style: str = 'text') -> str:
+        """Returns the formula rendered in `style` (`'text'`, `'latex'`, `'html'` or `'unicode'`), compiled once per formula."""
+        if style not in STYLES:
+            raise ValueError(f'Expected one of {STYLES} for `style` argument but received `{style!r}` instead.')
+        if style == 'latex':
+            return self.latexify()
+        return getattr(formula_template(self.comp_str), style)
 
     def __hash__(self) -> int:
-        return hash(tuple(item for item in self.elements.items()))
+        return hash(self.composition)
 
     def __eq__(self, other: Self) -> bool:
-        return self.elements == other.elements
-    
\ No newline at end of file
+        if not isinstance(other, Compound):
+            return NotImplemented
+        return self.composition == other.composition
+    
+
+def merge_duplicate_compounds(compounds: Iterable[Compound]) -> list[Compound]:
+    """
+    Returns `compounds` with equal species merged into one compound whose coefficient is their sum.
+
+    Runs in linear time by grouping on the compound hash. The merged compound keeps the
+    position and formula string of the first occurrence; compounds that occur once are
+    returned as is, and no input compound is modified.
+    """
+    merged: dict[Compound, Compound] = {}
+    for compound in compounds:
+        first = merged.get(compound)
+        if first is None:
+            merged[compound] = compound
+        else:
+            merged[compound] = first.with_coefficient(first.coefficient + compound.coefficient)
+    return list(merged.values())
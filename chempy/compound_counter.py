@@ -1,137 +1,186 @@
 from .element import Element
 from .compound import Compound
-from typing import Self, TypeVar, Any
+from typing import Self, Any
 from _collections_abc import Mapping
 
 
-def add_elements_laterally(tuple_object) -> dict[Element, float | int]:
-    element_counter: dict[Element, float | int] = dict()
-    for element, count in tuple_object:
-        element_get = element_counter.get
-        element_counter[element] = element_get(element, 0) + count
-    return element_counter
-
-
-def remove_duplicate_compounds(compounds: list[Compound]) -> list[Compound]:
-    new_comp_list: list[Compound] = []
-    for i, compound in enumerate(compounds):
-        comp = compound
-        if comp in new_comp_list:
-            continue
-        for comp2 in compounds[i+1:]:
-            if comp2 != comp:
-                continue
-            comp: Compound = comp + comp2
-        new_comp_list.append(comp)
-    return new_comp_list
-
-
 def check_is_compound(obj: Any) -> None:
     if not isinstance(obj, Compound):
         raise TypeError(f'Expected `Compound` in `iterable` argument but received 'f'`{obj.__class__.__name__}` instead.')
 
 
-def _count_elements(mapping, iterable):
-    if isinstance(iterable, list):
-        iterable = remove_duplicate_compounds(iterable)
-    for item in iterable:
-        check_is_compound(item)
-        item: Compound = item
-        mapping[item] = item.coefficient
+def check_is_counter(obj: Any) -> None:
+    if not isinstance(obj, CompoundCounter):
+        raise TypeError(f'Expected `CompoundCounter` for `other` argument but received '
+                        f'`{obj.__class__.__name__}` instead.')
+
+
+def _add_counts(totals: dict[Element, int | float], compound: Compound, factor: int | float) -> None:
+    for element, count in compound.composition.items():
+        total = totals.get(element, 0) + count * factor
+        if total:
+            totals[element] = total
+        else:
+            del totals[element]
 
 
 class CompoundCounter(dict):
-    def __init__(self, iterable, **kwds):
+    """
+    A multiset of compounds mapping each `Compound` to its coefficient.
+
+    `elements` (the element counts of the distinct compounds) and `totals` (the
+    element counts weighted by coefficient) are kept up to date on every insert,
+    removal and scaling, so neither is ever recomputed from scratch. The compounds
+    themselves are never modified: their `coefficient` is only read when they are
+    first counted.
+    """
+    def __init__(self, iterable=None, **kwds):
         super().__init__()
-        self.elements = dict()
-        self.update(iterable)
-        self.elements = self._retrieve_elements()
-        self.coefficients = [val for val in self.values()]
+        self.elements: dict[Element, int] = dict()
+        self.totals: dict[Element, int | float] = dict()
+        self.update(iterable, **kwds)
+
+    @property
+    def coefficients(self) -> list[int | float]:
+        return list(self.values())
+
+    def __setitem__(self, compound: Compound, coefficient: int | float) -> None:
+        check_is_compound(compound)
+        old = super().get(compound)
+        if old is None:
+            _add_counts(self.elements, compound, 1)
+        else:
+            _add_counts(self.totals, compound, -old)
+        _add_counts(self.totals, compound, coefficient)
+        super().__setitem__(compound, coefficient)
+
+    def __delitem__(self, compound: Compound) -> None:
+        coefficient = super().pop(compound)
+        _add_counts(self.elements, compound, -1)
+        _add_counts(self.totals, compound, -coefficient)
+
+    def pop(self, compound: Compound, *default):
+        if compound not in self:
+            if default:
+                return default[0]
+            raise KeyError(compound)
+        coefficient = self[compound]
+        del self[compound]
+        return coefficient
+
+    def popitem(self) -> tuple[Compound, int | float]:
+        compound = next(reversed(self.keys()))
+        return compound, self.pop(compound)
+
+    def setdefault(self, compound: Compound, default: int | float = 1) -> int | float:
+        if compound not in self:
+            self[compound] = default
+        return self[compound]
+
+    def clear(self) -> None:
+        super().clear()
+        self.elements.clear()
+        self.totals.clear()
+
+    def copy(self) -> Self:
+        counter = self.__class__()
+        dict.update(counter, self)
+        counter.elements = self.elements.copy()
+        counter.totals = self.totals.copy()
+        return counter
+
+    def __ior__(self, other: Mapping) -> Self:
+        for compound, coefficient in other.items():
+            self[compound] = coefficient
+        return self
 
-    def update(self, iterable, **kwds):
+    def add(self, compound: Compound, coefficient: int | float = 1) -> None:
+        """Adds `coefficient` units of `compound`, dropping it once its coefficient is no longer positive."""
+        total = self.get(compound, 0) + coefficient
+        if total > 0:
+            self[compound] = total
+        elif compound in self:
+            del self[compound]
+
+    def update(self, iterable=None, **kwds):
+        """
+        Adds compounds to the counter.
+
+        A `Mapping` adds `compound.coefficient * count` of every compound; any other
+        iterable adds each compound's own `coefficient`.
+        """
         if iterable is not None:
             if isinstance(iterable, Mapping):
-                if self:
-                    for comp, count in iterable.items():
-                        check_is_compound(comp)
-                        comp: Compound = comp
-                        comp.coefficient *= count
-                    iterable = remove_duplicate_compounds(list(iterable.keys()) + list(self.keys()))
-                    self.clear()
-                    for item in iterable:
-                        check_is_compound(item) 
-                        item: Compound = item
-                        self[item] = item.coefficient
-                    self.elements.update(self._retrieve_elements())
-                    self.coefficients = [val for val in self.values()]
-                else:
-                    for comp, count in iterable.items():
-                        check_is_compound(comp)
-                        comp: Compound = comp
-                        comp.coefficient *= count
-                    iterable = remove_duplicate_compounds(list(iterable.keys()))
-                    self.clear()
-                    for item in iterable:
-                        check_is_compound(item) 
-                        item: Compound = item
-                        self[item] = item.coefficient
-                    self.elements.update(self._retrieve_elements())
-                    self.coefficients = [val for val in self.values()]
+                for comp, count in iterable.items():
+                    check_is_compound(comp)
+                    comp: Compound = comp
+                    self.add(comp, comp.coefficient * count)
             else:
-                _count_elements(self, iterable)
+                for item in iterable:
+                    check_is_compound(item)
+                    item: Compound = item
+                    self.add(item, item.coefficient)
         if kwds:
             self.update(kwds)
-    
-    def _retrieve_elements(self) -> dict[Element, int]:
-        elements_dict: dict[Element, int] = dict()
-        for cmp in self.keys():
-            cmp: Compound = cmp
-            elements_get = elements_dict.get
-            for element, count in cmp.elements.items():
-                elements_dict[element] = elements_get(element, 0) + count 
-        return elements_dict 
-    
+
     def search_element_occurances(self, element: Element) -> dict[Compound, int]:
         return dict((cmp, cmp.count(element)) for cmp in self)
-    
+
     def is_equal(self, other: Self) -> bool:
-        if not isinstance(other, CompoundCounter):
-            raise TypeError(f'Expected `CompoundCounter` for `other` argument but received '
-                            f'`{other.__class__.__name__}` instead.')
-        return add_elements_laterally(tuple((element, count * compound.coefficient)
-                       for compound, _ in self.items()
-                       for element, count in compound.elements.items())) == \
-               add_elements_laterally(tuple((element, count * compound.coefficient)
-                       for compound, _ in other.items()
-                       for element, count in compound.elements.items()))
+        """Returns whether both counters hold the same number of atoms of every element."""
+        check_is_counter(other)
+        return self.totals == other.totals
 
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}({dict(self)})'
-    
+
     def flatten(self) -> list[Compound]:
         return list(self.keys())
 
-    def __add__(self, other: Self) -> Self:
-        if not isinstance(other, CompoundCounter):
-            raise TypeError(f'Expected `CompoundCounter` for `other` argument but received '
-                            f'`{other.__class__.__name__}` instead.')
-        for comp, count in other.items():
-            check_is_compound(comp)
-            comp: Compound = comp
-            comp.coefficient = count
-        iterable = remove_duplicate_compounds(list(other.keys()) + list(self.keys()))
-        self.clear()
-        for item in iterable:
-            check_is_compound(item) 
-            item: Compound = item
-            self[item] = item.coefficient
-        self.elements.update(self._retrieve_elements())
-        self.coefficients = [val for val in self.values()]
+    def __iadd__(self, other: Self) -> Self:
+        check_is_counter(other)
+        for compound, coefficient in other.items():
+            self.add(compound, coefficient)
+        return self
+
+    def __isub__(self, other: Self) -> Self:
+        check_is_counter(other)
+        for compound, coefficient in other.items():
+            self.add(compound, -coefficient)
         return self
-    
+
+    def __imul__(self, factor: int | float) -> Self:
+        if not isinstance(factor, (int, float)):
+            return NotImplemented
+        if factor <= 0:
+            raise ValueError(f'Expected a positive number for `factor` argument but received `{factor!r}` instead.')
+        for compound, coefficient in self.items():
+            super().__setitem__(compound, coefficient * factor)
+        for element in self.totals:
+            self.totals[element] *= factor
+        return self
+
+    def __add__(self, other: Self) -> Self:
+        check_is_counter(other)
+        counter = self.copy()
+        counter += other
+        return counter
+
+    def __sub__(self, other: Self) -> Self:
+        check_is_counter(other)
+        counter = self.copy()
+        counter -= other
+        return counter
+
+    def __mul__(self, factor: int | float) -> Self:
+        if not isinstance(factor, (int, float)):
+            return NotImplemented
+        counter = self.copy()
+        counter *= factor
+        return counter
+
+    __rmul__ = __mul__
+
     def __eq__(self, other: Self) -> bool:
-        if not isinstance(other, CompoundCounter):
-            raise TypeError(f'Expected `CompoundCounter` for `other` argument but received '
-                            f'`{other.__class__.__name__}` instead.')
+        check_is_counter(other)
         return self.elements == other.elements
-        
\ No newline at end of file
@@ -1,5 +1,15 @@
-from .delimeters import LEFT_DELIMS, RIGHT_DELIMS, ALL_DELIMS
-from .element_data import ELEMENTS_PATH, ELEMENT_ITEMS, ELEMENT_PROTON_DATA, ELEMENTS, electronegativity_data
+from .delimeters import LEFT_DELIMS, RIGHT_DELIMS, ALL_DELIMS, MATCHING_DELIMS, HYDRATE_DELIMS, CHARGE_DELIM
+from .element_data import (
+    ELEMENTS_PATH,
+    ELEMENT_INFO_PATH,
+    element_items,
+    element_proton_data,
+    element_symbols,
+    electronegativity_table,
+    electronegativity_data
+)
+from .thermo_data import THERMO_DATA_PATH, ThermoRow, thermo_rows
+from .periodic_table import PERIODIC_TABLE_PATH, PeriodicTable, periodic_table
 from .types import Shape, H_rxn
 from .qm_constants import MAX_SUBSHELL, SUBSHELL_MAP, SPECIAL_SUBSHELLS
 
@@ -7,7 +17,11 @@ __all__ = [
     'LEFT_DELIMS', 
     'RIGHT_DELIMS', 
     'ALL_DELIMS', 
+    'MATCHING_DELIMS',
+    'HYDRATE_DELIMS',
+    'CHARGE_DELIM',
     'ELEMENTS_PATH', 
+    'ELEMENT_INFO_PATH',
     'ELEMENT_ITEMS', 
     'ELEMENT_PROTON_DATA', 
     'ELEMENTS',
@@ -16,5 +30,23 @@ __all__ = [
     'MAX_SUBSHELL', 
     'SUBSHELL_MAP', 
     'SPECIAL_SUBSHELLS',
-    'electronegativity_data'
-]
\ No newline at end of file
+    'element_items',
+    'element_proton_data',
+    'element_symbols',
+    'electronegativity_table',
+    'electronegativity_data',
+    'PERIODIC_TABLE_PATH',
+    'PeriodicTable',
+    'periodic_table',
+    'THERMO_DATA_PATH',
+    'ThermoRow',
+    'thermo_rows'
+]
+
+
+def __getattr__(name: str):
+    """Forwards the lazily loaded `ELEMENT_ITEMS`, `ELEMENT_PROTON_DATA` and `ELEMENTS` to `element_data`."""
+    if name in ('ELEMENT_ITEMS', 'ELEMENT_PROTON_DATA', 'ELEMENTS'):
+        from . import element_data
+        return getattr(element_data, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
\ No newline at end of file
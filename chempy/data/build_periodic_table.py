@@ -0,0 +1,35 @@
+"""
+Compiles `periodic_table.bin` from its sources.
+
+    python -m chempy.data.build_periodic_table [--output PATH] [--check]
+"""
+import argparse
+import sys
+from .periodic_table import PERIODIC_TABLE_PATH, PeriodicTable, build_periodic_table
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Compile the periodic table snapshot.')
+    parser.add_argument('--output', default=PERIODIC_TABLE_PATH)
+    parser.add_argument('--check', action='store_true',
+                        help='exit with status 1 if the snapshot is missing or out of date instead of rebuilding it')
+    args = parser.parse_args()
+    if args.check:
+        try:
+            current = PeriodicTable.open(args.output).is_current()
+        except (OSError, ValueError):
+            current = False
+        print(f'{args.output} is {"up to date" if current else "out of date"}')
+        if current:
+            from ..qm_model import verify_electron_config_table
+            mismatched = verify_electron_config_table()
+            if mismatched:
+                print(f'Electron configurations differ from qm_model for atomic numbers {mismatched}')
+                current = False
+        return 0 if current else 1
+    print(f'Wrote {build_periodic_table(args.output)}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
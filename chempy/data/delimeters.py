@@ -1,3 +1,6 @@
 LEFT_DELIMS = ['[', '(', '{']
 RIGHT_DELIMS = [']', ')', '}']
-ALL_DELIMS = LEFT_DELIMS + RIGHT_DELIMS
\ No newline at end of file
+ALL_DELIMS = LEFT_DELIMS + RIGHT_DELIMS
+MATCHING_DELIMS = dict(zip(LEFT_DELIMS, RIGHT_DELIMS))
+HYDRATE_DELIMS = ['·', '•', '.', '*']
+CHARGE_DELIM = '^'
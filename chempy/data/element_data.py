@@ -1,21 +1,56 @@
-import json
 import os
-import pandas as pd
-from typing import Optional, Union
+from functools import cache
+from typing import Optional
 
 
 ELEMENTS_PATH = os.path.dirname(os.path.realpath(__file__)) + '/elements.json'
 ELEMENT_INFO_PATH = os.path.dirname(os.path.realpath(__file__)) + '/element_info.csv'
-ELEMENT_CSV_DATA = pd.read_csv(ELEMENT_INFO_PATH)
-df: pd.DataFrame = pd.DataFrame(ELEMENT_CSV_DATA)
-electronegativity_data: Optional[float] = lambda protons : (
-    dt.item() 
-    if not (
-        dt := (df.loc[df['AtomicNumber'] == protons, 'Electronegativity'])
-    ).isnull().item()
-    else None
-)
-with open(ELEMENTS_PATH, 'r') as fp:
-    ELEMENT_ITEMS: dict[str, str] = dict(json.load(fp))
-ELEMENT_PROTON_DATA = {element: i+1 for i, [element, _] in enumerate(ELEMENT_ITEMS.items())}
-ELEMENTS = sorted(ELEMENT_ITEMS.keys(), key=len, reverse=True)
\ No newline at end of file
+
+
+@cache
+def element_items() -> dict[str, str]:
+    """Returns the molar mass (as written in `elements.json`) of every element symbol, in atomic number order."""
+    import json
+    with open(ELEMENTS_PATH, 'r') as fp:
+        return dict(json.load(fp))
+
+
+@cache
+def element_proton_data() -> dict[str, int]:
+    """Returns the atomic number of every element symbol."""
+    return {element: i+1 for i, element in enumerate(element_items())}
+
+
+@cache
+def element_symbols() -> list[str]:
+    """Returns every element symbol, longest first."""
+    return sorted(element_items().keys(), key=len, reverse=True)
+
+
+@cache
+def electronegativity_table() -> dict[int, Optional[float]]:
+    """Returns the Pauling electronegativity of every atomic number listed in `element_info.csv` (`None` if unknown)."""
+    import csv
+    with open(ELEMENT_INFO_PATH, 'r', newline='') as fp:
+        return {
+            int(row['AtomicNumber']): float(row['Electronegativity']) if row['Electronegativity'] else None
+            for row in csv.DictReader(fp)
+        }
+
+
+def electronegativity_data(protons: int) -> Optional[float]:
+    return electronegativity_table()[protons]
+
+
+_LAZY_DATA = {
+    'ELEMENT_ITEMS': element_items,
+    'ELEMENT_PROTON_DATA': element_proton_data,
+    'ELEMENTS': element_symbols,
+}
+
+
+def __getattr__(name: str):
+    """Loads `ELEMENT_ITEMS`, `ELEMENT_PROTON_DATA` and `ELEMENTS` on first access instead of at import time."""
+    if name in _LAZY_DATA:
+        return _LAZY_DATA[name]()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
\ No newline at end of file
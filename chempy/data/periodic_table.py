@@ -0,0 +1,205 @@
+"""
+Precompiled, memory-mapped periodic table.
+
+`elements.json`, `element_info.csv` and the electron configurations computed by
+`chempy.qm_model` are compiled into `periodic_table.bin`, a packed little-endian
+file laid out as fixed-width columns:
+
+    header         magic, version, element count, orbital count, source digest
+    molar_mass     float64[count]
+    electroneg.    float64[count]    (NaN when unknown)
+    cfg_offsets    uint16[count + 1] (index of each element's first orbital)
+    valence        uint8[count]
+    symbols        3 bytes[count]    (ASCII, NUL padded)
+    orbitals       (n, l, electrons) uint8 triples[orbital count]
+
+At runtime the file is memory-mapped read-only, so numeric lookups by atomic
+number or symbol are O(1) slices of shared pages and forked workers share one
+copy through the page cache.
+
+Rebuild it after editing any of its sources with:
+
+    python -m chempy.data.build_periodic_table
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from functools import cache
+from typing import Optional, Self
+
+
+PERIODIC_TABLE_PATH = os.path.dirname(os.path.realpath(__file__)) + '/periodic_table.bin'
+MAGIC = b'CHPT'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI32s')
+HEADER_SIZE = 48
+SYMBOL_SIZE = 3
+
+type Orbitals = tuple[tuple[int, int, int], ...]
+
+
+def _source_paths() -> list[str]:
+    from .element_data import ELEMENTS_PATH, ELEMENT_INFO_PATH
+    package = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    return [ELEMENTS_PATH, ELEMENT_INFO_PATH, package + '/qm_model.py', package + '/orbital.py']
+
+
+def source_digest() -> bytes:
+    """Returns the SHA-256 digest of every file the snapshot is compiled from."""
+    digest = hashlib.sha256()
+    for path in _source_paths():
+        with open(path, 'rb') as fp:
+            digest.update(fp.read())
+    return digest.digest()
+
+
+def _layout(count: int, orbital_count: int) -> dict[str, int]:
+    offsets = {'molar_mass': HEADER_SIZE}
+    offsets['electronegativity'] = offsets['molar_mass'] + 8 * count
+    offsets['cfg_offsets'] = offsets['electronegativity'] + 8 * count
+    offsets['valence'] = offsets['cfg_offsets'] + 2 * (count + 1)
+    offsets['symbols'] = offsets['valence'] + count
+    offsets['orbitals'] = offsets['symbols'] + SYMBOL_SIZE * count
+    offsets['end'] = offsets['orbitals'] + 3 * orbital_count
+    return offsets
+
+
+def compile_periodic_table() -> bytes:
+    """Compiles the element data and computed electron configurations into the packed snapshot format."""
+    from .element_data import element_items, electronegativity_table
+    from .qm_constants import SUBSHELL_MAP
+    from ..qm_model import compute_electron_config, get_valence_electrons
+    items = element_items()
+    electronegativities = electronegativity_table()
+    symbols, molar_masses, negativities, valences, cfg_offsets, orbitals = [], [], [], [], [0], []
+    for protons, (symbol, molar_mass) in enumerate(items.items(), start=1):
+        e_cfg = compute_electron_config(protons)
+        symbols.append(symbol.encode('ascii'))
+        molar_masses.append(float(molar_mass))
+        electronegativity = electronegativities.get(protons)
+        negativities.append(float('nan') if electronegativity is None else electronegativity)
+        valences.append(get_valence_electrons(e_cfg))
+        orbitals.extend((o.n, SUBSHELL_MAP.index(o.shape), o.electrons) for o in e_cfg)
+        cfg_offsets.append(len(orbitals))
+    count = len(symbols)
+    layout = _layout(count, len(orbitals))
+    buffer = bytearray(layout['end'])
+    HEADER.pack_into(buffer, 0, MAGIC, VERSION, count, len(orbitals), source_digest())
+    struct.pack_into(f'<{count}d', buffer, layout['molar_mass'], *molar_masses)
+    struct.pack_into(f'<{count}d', buffer, layout['electronegativity'], *negativities)
+    struct.pack_into(f'<{count + 1}H', buffer, layout['cfg_offsets'], *cfg_offsets)
+    struct.pack_into(f'<{count}B', buffer, layout['valence'], *valences)
+    struct.pack_into(f'<{count * SYMBOL_SIZE}s', buffer, layout['symbols'],
+                     b''.join(s.ljust(SYMBOL_SIZE, b'\0') for s in symbols))
+    struct.pack_into(f'<{3 * len(orbitals)}B', buffer, layout['orbitals'],
+                     *(value for orbital in orbitals for value in orbital))
+    return bytes(buffer)
+
+
+def build_periodic_table(path: str = PERIODIC_TABLE_PATH) -> str:
+    """Writes the compiled snapshot to `path` atomically and returns `path`."""
+    data = compile_periodic_table()
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as fp:
+        fp.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+class PeriodicTable:
+    """
+    Read-only view over a compiled periodic table snapshot.
+
+    Elements are addressed by atomic number (`int`) or symbol (`str`). The numeric
+    columns `molar_masses`, `electronegativities` and `valence_electrons` are
+    zero-copy `memoryview`s indexed by `atomic number - 1`.
+    """
+    def __init__(self, buffer) -> None:
+        self._buffer = memoryview(buffer)
+        magic, version, count, orbital_count, self.digest = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'Unsupported periodic table snapshot (magic={magic!r}, version={version}).')
+        layout = _layout(count, orbital_count)
+        if len(self._buffer) < layout['end']:
+            raise ValueError('Truncated periodic table snapshot.')
+        self.count = count
+        self.molar_masses = self._column(layout['molar_mass'], count, 'd')
+        self.electronegativities = self._column(layout['electronegativity'], count, 'd')
+        self._cfg_offsets = self._column(layout['cfg_offsets'], count + 1, 'H')
+        self.valence_electrons = self._buffer[layout['valence']:layout['symbols']]
+        self._symbols = self._buffer[layout['symbols']:layout['orbitals']]
+        self._orbitals = self._buffer[layout['orbitals']:layout['end']]
+        self._atomic_numbers: Optional[dict[str, int]] = None
+
+    def _column(self, offset: int, length: int, fmt: str) -> memoryview:
+        size = struct.calcsize(fmt) * length
+        view = self._buffer[offset:offset + size]
+        if sys.byteorder == 'little':
+            return view.cast(fmt)
+        return memoryview(struct.pack(f'={length}{fmt}', *struct.unpack(f'<{length}{fmt}', view)))
+
+    @classmethod
+    def open(cls, path: str = PERIODIC_TABLE_PATH) -> Self:
+        """Memory-maps the snapshot at `path`."""
+        with open(path, 'rb') as fp:
+            return cls(mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(count={self.count})'
+
+    def is_current(self) -> bool:
+        """Returns whether the snapshot was compiled from the current source files."""
+        return self.digest == source_digest()
+
+    @property
+    def atomic_numbers(self) -> dict[str, int]:
+        """Maps every element symbol to its atomic number."""
+        if self._atomic_numbers is None:
+            self._atomic_numbers = {self.symbol(z): z for z in range(1, self.count + 1)}
+        return self._atomic_numbers
+
+    def atomic_number(self, key: int | str) -> int:
+        """Returns the atomic number of `key` (a symbol or an atomic number)."""
+        if isinstance(key, str):
+            try:
+                return self.atomic_numbers[key]
+            except KeyError:
+                raise ValueError(f'"{key}" is not a valid `Element`.') from None
+        if not 1 <= key <= self.count:
+            raise ValueError(f'No element has atomic number {key}.')
+        return key
+
+    def symbol(self, atomic_number: int) -> str:
+        start = (atomic_number - 1) * SYMBOL_SIZE
+        return bytes(self._symbols[start:start + SYMBOL_SIZE]).rstrip(b'\0').decode('ascii')
+
+    def molar_mass(self, key: int | str) -> float:
+        return self.molar_masses[self.atomic_number(key) - 1]
+
+    def electronegativity(self, key: int | str) -> Optional[float]:
+        value = self.electronegativities[self.atomic_number(key) - 1]
+        return None if value != value else value
+
+    def valence(self, key: int | str) -> int:
+        return self.valence_electrons[self.atomic_number(key) - 1]
+
+    def electron_config(self, key: int | str) -> Orbitals:
+        """Returns the ground-state configuration of `key` as `(n, l, electrons)` triples."""
+        index = self.atomic_number(key) - 1
+        start, end = self._cfg_offsets[index], self._cfg_offsets[index + 1]
+        raw = self._orbitals[3 * start:3 * end]
+        return tuple((raw[i], raw[i + 1], raw[i + 2]) for i in range(0, len(raw), 3))
+
+
+@cache
+def periodic_table() -> PeriodicTable:
+    """Returns the process-wide `PeriodicTable`, compiling it in memory if the snapshot file is missing or unreadable."""
+    try:
+        return PeriodicTable.open()
+    except (OSError, ValueError):
+        return PeriodicTable(compile_periodic_table())
@@ -0,0 +1,35 @@
+"""
+Standard thermochemical data at 298.15 K and 1 bar, compiled from the NBS tables of
+chemical thermodynamic properties and the CRC Handbook: enthalpy of formation
+(kJ/mol), molar entropy (J/(mol K)) and Gibbs energy of formation (kJ/mol) per
+species and phase.
+
+The first row of each formula in `thermo_data.csv` is its standard state at
+298.15 K and is used when no phase is requested.
+"""
+import os
+from functools import cache
+from typing import NamedTuple
+
+
+THERMO_DATA_PATH = os.path.dirname(os.path.realpath(__file__)) + '/thermo_data.csv'
+
+
+class ThermoRow(NamedTuple):
+    formula: str
+    phase: str
+    enthalpy_of_formation: float
+    entropy: float
+    gibbs_energy_of_formation: float
+
+
+@cache
+def thermo_rows() -> tuple[ThermoRow, ...]:
+    """Returns every row of `thermo_data.csv` in file order."""
+    import csv
+    with open(THERMO_DATA_PATH, 'r', newline='') as fp:
+        return tuple(
+            ThermoRow(row['Formula'], row['Phase'], float(row['EnthalpyOfFormation']),
+                      float(row['Entropy']), float(row['GibbsEnergyOfFormation']))
+            for row in csv.DictReader(fp)
+        )
@@ -1,29 +1,98 @@
-from .data import *
-from .qm_model import get_valence_electrons, get_electron_config
-from typing import Optional, Self
+from .data import periodic_table
+from .qm_model import electron_config_tuples
+from .orbital import Orbital
+from typing import NamedTuple, Optional, Self
+
+
+class ElementRecord(NamedTuple):
+    """Immutable per-element data, read once per symbol from the periodic table snapshot and shared by every `Element`."""
+    symbol: str
+    molar_mass: float
+    protons: int
+    e_cfg: tuple[Orbital, ...]
+    electron_configuration: str
+    valence_electrons: int
+    electronegativity: Optional[float]
+
+
+_RECORDS: dict[str, ElementRecord] = {}
+
+
+def element_record(symbol: str) -> ElementRecord:
+    """Returns the `ElementRecord` of `symbol`, building it from the periodic table snapshot on first use."""
+    record = _RECORDS.get(symbol)
+    if record is not None:
+        return record
+    table = periodic_table()
+    protons = table.atomic_number(symbol)
+    e_cfg = tuple(Orbital(n, l, electrons) for n, l, electrons in electron_config_tuples(protons))
+    record = ElementRecord(
+        symbol=symbol,
+        molar_mass=table.molar_mass(protons),
+        protons=protons,
+        e_cfg=e_cfg,
+        electron_configuration=' '.join(str(o) for o in e_cfg),
+        valence_electrons=table.valence(protons),
+        electronegativity=table.electronegativity(protons),
+    )
+    _RECORDS[symbol] = record
+    return record
 
 
 class Element:
-    def __init__(self, symbol: str, mass: Optional[float] = None):
+    """
+    An immutable chemical element.
+
+    `Element(symbol)` returns the interned instance for `symbol`, so every compound,
+    token and equation shares one object per element. Passing a `mass` creates a
+    separate instance carrying that sample's `mass` and `moles`.
+    """
+    __slots__ = (
+        'symbol',
+        'molar_mass',
+        'protons',
+        'e_cfg',
+        'electron_configuration',
+        'valence_electrons',
+        'electronegativity',
+        'electrons',
+        'mass',
+        'moles',
+    )
+    _registry: dict[str, Self] = {}
+
+    def __new__(cls, symbol: str, mass: Optional[float] = None) -> Self:
         if not isinstance(symbol, str):
             raise TypeError('Expected `str` for `symbol` argument but received '
                             f'`{symbol.__class__.__name__}` instead.')
-        if symbol not in ELEMENTS:
-            raise ValueError(f'"{symbol}" is not a valid `Element`.')
-        assert isinstance(symbol, str)
-        self.symbol = symbol
-        self.molar_mass = float(ELEMENT_ITEMS[self.symbol])
-        self.protons = ELEMENT_PROTON_DATA[self.symbol]
-        self.e_cfg = get_electron_config(self.protons)
-        self.electron_configuration = ' '.join(str(o) for o in self.e_cfg)
-        self.valence_electrons = get_valence_electrons(self.e_cfg)
-        self.electronegativity: Optional[float] = electronegativity_data(self.protons)     # type: ignore        
-        self.electrons = self.protons
-        self.mass = mass
-        self.moles = None
-        if self.mass is not None:
-            self.moles = self.mass / self.molar_mass
-        
+        if mass is None:
+            interned = cls._registry.get(symbol)
+            if interned is not None:
+                return interned
+        record = element_record(symbol)
+        element = super().__new__(cls)
+        for field in ElementRecord._fields:
+            object.__setattr__(element, field, getattr(record, field))
+        object.__setattr__(element, 'electrons', record.protons)
+        object.__setattr__(element, 'mass', mass)
+        object.__setattr__(element, 'moles', None if mass is None else mass / record.molar_mass)
+        if mass is None:
+            cls._registry[symbol] = element
+        return element
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f'`{self.__class__.__name__}` is immutable; cannot set `{name}`.')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'`{self.__class__.__name__}` is immutable; cannot delete `{name}`.')
+
+    def __reduce__(self):
+        return (self.__class__, (self.symbol, self.mass))
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._registry = {}
+
     def __str__(self) -> str:
         return self.symbol
 
@@ -41,12 +110,12 @@ class Element:
         assert isinstance(other, int)
         from .compound import Compound
         return Compound(f'{self.symbol}{other}')
-    
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}('{self.symbol}')"
-    
+
     def __hash__(self) -> int:
         return hash(self.symbol)
-    
+
     def __eq__(self, other: Self) -> bool:
-        return self.symbol == other.symbol
\ No newline at end of file
+        return self is other or self.symbol == other.symbol
@@ -1,12 +1,9 @@
-from .compound import Compound
+from .compound import Compound, merge_duplicate_compounds
 from .data import H_rxn
 from .element import Element
-from .utils import split_str
+from .render import render_equation
+from .utils import split_str, split_terms, balance_coefficients, BalanceError
 from collections import Counter
-from fractions import Fraction
-import numpy as np
-from string import ascii_lowercase
-import sympy as smp
 from typing import Optional, Self
 
 
@@ -15,26 +12,12 @@ def extract_elements(compound: Compound) -> Counter[Element]:
         Returns a Counter of elements in a specific compound.
         """
         elements = Counter()
-        cmp = compound.elements.most_common()
+        cmp = compound.composition.most_common()
         for (element, count) in cmp:
             elements[element] = count
         return elements
 
 
-def remove_duplicate_compounds(compounds: list[Compound]) -> list[Compound]:
-    new_comp_list: list[Compound] = []
-    for i, compound in enumerate(compounds):
-        comp = compound
-        if comp in new_comp_list:
-            continue
-        for comp2 in compounds[i+1:]:
-            if comp2 != comp:
-                continue
-            comp = comp2 + comp
-        new_comp_list.append(comp)
-    return new_comp_list
-
-
 class Equation:
     def __init__(self, reactants: list[Compound], products: list[Compound]):
         if not isinstance(reactants, list):
@@ -43,42 +26,43 @@ class Equation:
         if not isinstance(products, list):
             raise TypeError('Expected `list[Compound]` for `products` argument but received '
                             f'`{products.__class__.__name__}` instead.')
-        self.reactants = remove_duplicate_compounds(reactants)
-        self.products = remove_duplicate_compounds(products)
+        self.reactants = merge_duplicate_compounds(reactants)
+        self.products = merge_duplicate_compounds(products)
         self.compounds = self.reactants + self.products
         self.coefficients: list[int | float | str] = [compound.coefficient for compound in self.compounds]
+        self._rendered: dict[str, tuple[tuple, str]] = {}
         self.equation = self._equation()
         self.h_rxn: Optional[int | float] = None
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.reactants}, {self.products})"
 
-    def _center_str(self, inp: int | float, latex: bool) -> str:
-        """Encases the string in \\text{} for use when displayed in latex. Typically used to format coefficients."""
-        return str(inp) if latex in [None, False] else f'\\text{{{inp}}}'
+    def _format_coefficient(self, coef: int | float | str) -> Optional[str]:
+        """Returns the coefficient as displayed, or `None` when it is 1 and left out."""
+        return None if coef == 1 or coef == '1' else str(coef)
 
-    def _latex(self, inp: Compound, latex: bool) -> str:
-        """Returns a latexified or normal representation of the equation, denoted by whether latex is specified to be True or False."""
-        return inp.comp_str.strip() if latex in [None, False] else inp.latexify()  
+    def render(self, style: str = 'text') -> str:
+        """
+        Returns the equation rendered in `style` (`'text'`, `'latex'`, `'html'` or `'unicode'`).
+
+        Formulas come from their cached templates (see `chempy.render`) and the result is
+        kept until the species or coefficients change.
+        """
+        key = (tuple(self.coefficients), tuple(c.comp_str for c in self.reactants), tuple(c.comp_str for c in self.products))
+        cached = self._rendered.get(style)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        split = len(self.reactants)
+        rendered = render_equation(
+            ((c, self._format_coefficient(coef)) for c, coef in zip(self.reactants, self.coefficients[:split])),
+            ((c, self._format_coefficient(coef)) for c, coef in zip(self.products, self.coefficients[split:])),
+            style)
+        self._rendered[style] = (key, rendered)
+        return rendered
 
     def _equation(self, latex: bool = False) -> str:
         """Returns the equation as a string in either latex or non-latex format."""
-        return ' + '.join(
-            [
-                self._center_str(coef, latex) + f'({self._latex(reactant, latex)})' 
-                if float(str(coef).replace(',', '')) != 1 
-                else self._latex(reactant, latex)
-                for reactant, coef in 
-                zip(self.reactants, self.coefficients[:len(self.reactants)])
-            ]) \
-        + ' → ' + \
-            ' + '.join(
-                [
-                    self._center_str(coef, latex) + f'({self._latex(product, latex)})' 
-                    if float(str(coef).replace(',', '')) != 1
-                    else self._latex(product, latex)
-                    for product, coef in zip(self.products, self.coefficients[len(self.reactants):])
-                ])
+        return self.render('latex' if latex else 'text')
 
     def _repr_latex_(self) -> str:
         """Returns latex representation of an equation."""
@@ -92,7 +76,7 @@ class Equation:
         """Returns a Counter of elements to the left of the equation (in the reactants)."""
         reactants = Counter()
         for reactant in self.reactants:
-            compound = reactant.elements.most_common()
+            compound = reactant.composition.most_common()
             for (element, count) in compound:
                 reactants[element] += count 
         return reactants
@@ -101,7 +85,7 @@ class Equation:
         """Returns a Counter of elements to the right of the equation (in the products)."""
         products = Counter()
         for product in self.products:
-            compound = product.elements.most_common()
+            compound = product.composition.most_common()
             for (element, count) in compound:
                 products[element] += count 
         return products
@@ -114,27 +98,18 @@ class Equation:
         """Counts occurances of an element out of all the products."""
         return [compound.count(element) for compound in self.products]
 
-    def _get_coefficients(self, data: list[list[int]]) -> list[str]:
+    def _get_coefficients(self, data: list[list[int]], strict: bool = False) -> list[str]:
         """
         Returns a list of coefficients, 
         whose indices correspond to the positions of compounds in the given equation.
         """
-        matrix = smp.Matrix(data)
-        length = matrix.shape[1]
-        symbols = [smp.Symbol(f'{ascii_lowercase[n]}') for n in range(length)]
-        solutions = smp.linsolve(matrix, symbols)
-        solutions = solutions.subs([(symbol, 1) for symbol in symbols])
-        if solutions.args == ():
+        try:
+            coefficients = balance_coefficients(data, len(self.compounds), strict=strict)
+        except BalanceError:
+            if strict:
+                raise
             print('Impossible equation')
             return [f'{arg:,}' for arg in self.coefficients]
-        args = solutions.args[0]
-        args: list[Fraction] = [Fraction(abs(arg)).limit_denominator() for arg in args]
-        denom_list = [frac.denominator for frac in args if frac.denominator != 1]
-        if denom_list != []:
-            while not all(arg.denominator == 1 for arg in args):
-                denom_list = [frac.denominator for frac in args if frac.denominator != 1]
-                args = [arg * max(denom_list) for arg in args]
-        coefficients = [arg.numerator for arg in args]
         for i, compound in enumerate(self.reactants + self.products):
             compound.coefficient = coefficients[i]
         return [f'{coef:,}' for coef in coefficients]
@@ -155,14 +130,19 @@ class Equation:
                 right_count[f'{element}'] += elements[element] * compound.coefficient
         return left_count == right_count
 
-    def balance(self) -> None:
-        """Balances the chemical equation."""
+    def balance(self, strict: bool = False) -> None:
+        """
+        Balances the chemical equation.
+
+        With `strict=True`, raises a `BalanceError` instead of printing a message when the
+        equation is impossible, underdetermined or could not be balanced.
+        """
         if self.get_is_balanced():
             self.equation = self._equation()
             return
-        reactant_elements = self.total_left()
+        elements = self.total_left() | self.total_right()
         matrix = []
-        for element in reactant_elements:
+        for element in elements:
             row = [0 for _ in range(len(self.reactants) + len(self.products))]
             left_count = self.count_left(element)
             right_count = self.count_right(element)
@@ -171,11 +151,27 @@ class Equation:
             for count, i in zip(right_count, range(len(self.reactants), len(self.products)+len(self.reactants)+1)):
                 row[i] = -count
             matrix.append(row)
-        self.coefficients = self._get_coefficients(matrix)
+        self.coefficients = self._get_coefficients(matrix, strict)
         if not self.get_is_balanced():
+            if strict:
+                raise BalanceError('An error occured while balancing the chemical equation.')
             print('An error occured while balancing the chemical equation.')
         self.equation = self._equation()
 
+    def stoichiometry(self) -> dict[Compound, int | float]:
+        """Returns the net coefficient of every species, negative for reactants and positive for products."""
+        net: dict[Compound, int | float] = {}
+        for compound in self.reactants:
+            net[compound] = net.get(compound, 0) - compound.coefficient
+        for compound in self.products:
+            net[compound] = net.get(compound, 0) + compound.coefficient
+        return net
+
+    def limiting_reagent(self, masses=None, moles=None):
+        """Returns the limiting reagent, theoretical yields and excess amounts for (batches of) reactant amounts (see `chempy.stoichiometry`)."""
+        from .stoichiometry import limiting_reagent
+        return limiting_reagent(self, masses=masses, moles=moles)
+
     def _matching_coefficient(self, comp: Compound) -> int:
         for i, compound in enumerate(self.compounds):
             if compound != comp:
@@ -228,7 +224,7 @@ class Equation:
     def parse_from_string(cls, line: str):
         reactants, products = line.split(split_str(line))
         reactants = [Compound(reactant) 
-                     for reactant in reactants.split('+')]
+                     for reactant in split_terms(reactants)]
         products = [Compound(product) 
-                    for product in products.split('+')]
+                    for product in split_terms(products)]
         return cls(reactants, products)
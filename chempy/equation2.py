@@ -1,10 +1,8 @@
 from .compound import Compound
 from .compound_counter import CompoundCounter
-import sympy as smp
-from string import ascii_lowercase
-from fractions import Fraction
+from .render import render_equation
 from typing import Any, Self, Optional
-from .utils import split_str
+from .utils import split_str, split_terms, balance_coefficients, BalanceError
 
 class Meta(type):
     def __call__(cls, *args: Any, **kwargs: Any) -> Any:
@@ -18,9 +16,9 @@ class Meta(type):
                     break
                 reactants, products = arg.split(split_str(arg))
                 reactants = CompoundCounter([Compound(reactant) 
-                            for reactant in reactants.split('+')])
+                            for reactant in split_terms(reactants)])
                 products = CompoundCounter([Compound(product) 
-                            for product in products.split('+')])
+                            for product in split_terms(products)])
                 break
             elif type(arg) is CompoundCounter:
                 if reactants and products:
@@ -45,74 +43,96 @@ class Equation2(metaclass=Meta):
     def __init__(self, *args, **kwargs) -> None:
         self.reactants: CompoundCounter = self.reactants
         self.products: CompoundCounter = self.products
-        self.compounds: list[Compound] = self.reactants.flatten() + self.products.flatten()
+        self.compounds: list[Compound] = self._compounds()
+        self._rendered: dict[str, tuple[tuple, str]] = {}
         self.equation = self._equation()
         self.h_rxn: Optional[int | float] = None
 
-    def _center_str(self, inp: int | float, latex: bool) -> str:
-        """Encases the string in \\text{} for use when displayed in latex. Typically used to format coefficients."""
-        return f'{inp:,}' if latex in [None, False] else f'\\text{{{inp:,}}}'
-    
-    def _latex(self, inp: Compound, latex: bool) -> str:
-        """Returns a latexified or normal representation of the equation, denoted by whether latex is specified to be True or False."""
-        return inp.comp_str.strip() if latex in [None, False] else inp.latexify()  
+    def _compounds(self) -> list[Compound]:
+        """Returns every compound, carrying its coefficient from the counters, without modifying the counted compounds."""
+        return [compound if compound.coefficient == coefficient else compound.with_coefficient(coefficient)
+                for counter in (self.reactants, self.products)
+                for compound, coefficient in counter.items()]
+
+    def _format_coefficient(self, coefficient: int | float) -> Optional[str]:
+        """Returns the coefficient as displayed, or `None` when it is 1 and left out."""
+        return None if coefficient == 1 else f'{coefficient:,}'
+
+    def render(self, style: str = 'text') -> str:
+        """
+        Returns the equation rendered in `style` (`'text'`, `'latex'`, `'html'` or `'unicode'`).
+
+        Formulas come from their cached templates (see `chempy.render`) and the result is
+        kept until the species or coefficients change.
+        """
+        key = tuple((c.comp_str, coefficient) for counter in (self.reactants, self.products)
+                    for c, coefficient in counter.items()) + (len(self.reactants),)
+        cached = self._rendered.get(style)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        rendered = render_equation(
+            ((c, self._format_coefficient(coefficient)) for c, coefficient in self.reactants.items()),
+            ((c, self._format_coefficient(coefficient)) for c, coefficient in self.products.items()),
+            style)
+        self._rendered[style] = (key, rendered)
+        return rendered
 
     def _equation(self, latex: bool = False) -> str:
-        return ' + '.join(self._center_str(reactant.coefficient, latex) + \
-                          f'({self._latex(reactant, latex)})'
-                          if float(str(reactant.coefficient).replace(',', '')) != 1
-                          else self._latex(reactant, latex)
-                          for reactant in self.reactants.keys()) + ' → ' + \
-               ' + '.join(self._center_str(product.coefficient, latex) + \
-                          f'({self._latex(product, latex)})'
-                          if float(str(product.coefficient).replace(',', '')) != 1
-                          else self._latex(product, latex)
-                          for product in self.products.keys())
+        return self.render('latex' if latex else 'text')
     
-    def _get_coefficients(self, data: list[list[int]]) -> None:
-        matrix = smp.Matrix(data)
-        length = matrix.shape[1]
-        symbols = [smp.Symbol(f'{ascii_lowercase[n]}') for n in range(length)]
-        solutions = smp.linsolve(matrix, symbols)
-        solutions = solutions.subs([(symbol, 1) for symbol in symbols])
-        if solutions.args == ():
+    def _get_coefficients(self, data: list[list[int]], strict: bool = False) -> None:
+        try:
+            coefficients = balance_coefficients(data, len(self.reactants) + len(self.products), strict=strict)
+        except BalanceError:
+            if strict:
+                raise
             print('Impossible equation')
             return None
-        args = solutions.args[0]
-        args: list[Fraction] = [Fraction(abs(arg)).limit_denominator() for arg in args]
-        denom_list = [frac.denominator for frac in args if frac.denominator != 1]
-        if denom_list != []:
-            while not all(arg.denominator == 1 for arg in args):
-                denom_list = [frac.denominator for frac in args if frac.denominator != 1]
-                args = [arg * max(denom_list) for arg in args]
-        coefficients = [arg.numerator for arg in args]
         for i, compound in enumerate(self.reactants.flatten() + self.products.flatten()):
             matching_coefficient = coefficients[i]
             if i <= len(self.reactants) - 1:
                 self.reactants[compound] = matching_coefficient
             else:
                 self.products[compound] = matching_coefficient
-            compound.coefficient = matching_coefficient
-        self.compounds = self.reactants.flatten() + self.products.flatten()
+        self.compounds = self._compounds()
 
-    def balance(self) -> None:
+    def balance(self, strict: bool = False) -> None:
         """
         Balances the Chemical Equation.
+
+        With `strict=True`, raises a `BalanceError` instead of printing a message when the
+        equation is impossible, underdetermined or could not be balanced.
         """
         if self.reactants.is_equal(self.products):
             self.equation = self._equation()
             return
         matrix = []
-        for element in self.reactants.elements:
+        for element in self.reactants.elements | self.products.elements:
             row: list[int] = []
             row.extend(self.reactants.search_element_occurances(element).values())
             row.extend(-val for val in self.products.search_element_occurances(element).values())
             matrix.append(row)
-        self._get_coefficients(matrix)
+        self._get_coefficients(matrix, strict)
         if not self.reactants.is_equal(self.products):
+            if strict:
+                raise BalanceError('An error occured while balancing the chemical equation.')
             print('An error occured while balancing the chemical equation.')
         self.equation = self._equation()
 
+    def stoichiometry(self) -> dict[Compound, int | float]:
+        """Returns the net coefficient of every species, negative for reactants and positive for products."""
+        net: dict[Compound, int | float] = {}
+        for compound, coefficient in self.reactants.items():
+            net[compound] = net.get(compound, 0) - coefficient
+        for compound, coefficient in self.products.items():
+            net[compound] = net.get(compound, 0) + coefficient
+        return net
+
+    def limiting_reagent(self, masses=None, moles=None):
+        """Returns the limiting reagent, theoretical yields and excess amounts for (batches of) reactant amounts (see `chempy.stoichiometry`)."""
+        from .stoichiometry import limiting_reagent
+        return limiting_reagent(self, masses=masses, moles=moles)
+
     def _repr_latex_(self) -> str:
         """Returns latex representation of an equation."""
         return f'${self._equation(latex=True)}$'
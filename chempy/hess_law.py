@@ -1,7 +1,10 @@
 from .compound import Compound
 from .equation import Equation
-import numpy as np
-from typing import Optional
+from .equation2 import Equation2
+from .reaction_library import ReactionLibrary
+from collections.abc import Sequence
+from fractions import Fraction
+from typing import NamedTuple, Optional
 
 
 def extract_coefficient(comp_str: str) -> tuple[float, bool]:
@@ -18,6 +21,182 @@ def extract_coefficient(comp_str: str) -> tuple[float, bool]:
     return eval(subs), no_subscript
 
 
+class HessSolution(NamedTuple):
+    """
+    A combination of reactions reproducing a target reaction.
+
+    `weights` maps the position (or `ReactionLibrary` id) of every reaction used to
+    its multiplier; `residual` is the Euclidean norm of the species left unbalanced,
+    0 when `exact`.
+    """
+    h_rxn: float
+    weights: dict[int, float]
+    residual: float
+    exact: bool
+
+
+type Stoichiometry = dict[str, int | float]
+
+
+def _stoichiometry(equation: Equation | Equation2) -> Stoichiometry:
+    return {compound.composition.formula: coefficient
+            for compound, coefficient in equation.stoichiometry().items() if coefficient}
+
+
+def _candidates(reactions: Sequence[Equation | Equation2] | ReactionLibrary
+                ) -> tuple[list[Stoichiometry], list[Optional[float]], dict[str, set[int]]]:
+    """Returns the stoichiometry and enthalpy of every reaction and the species index over them."""
+    if isinstance(reactions, ReactionLibrary):
+        columns = [reactions.record(i).species for i in range(len(reactions))]
+        h_rxns = [reactions.record(i).h_rxn for i in range(len(reactions))]
+        index = reactions.species_index()
+        return columns, h_rxns, index
+    columns = [_stoichiometry(equation) for equation in reactions]
+    h_rxns = [equation.h_rxn for equation in reactions]
+    index: dict[str, set[int]] = {}
+    for i, column in enumerate(columns):
+        for species in column:
+            index.setdefault(species, set()).add(i)
+    return columns, h_rxns, index
+
+
+def _subtract(row: dict, pivot_row: dict, factor: Fraction) -> None:
+    """Subtracts `factor` times `pivot_row` from `row` in place, dropping entries that become 0."""
+    for k, v in pivot_row.items():
+        value = row.get(k, 0) - factor * v
+        if value:
+            row[k] = value
+        else:
+            row.pop(k, None)
+
+
+class _Elimination:
+    """
+    Gauss-Jordan elimination of `sum(w[j] * columns[j]) == target` over the rationals, one layer of columns at a time.
+
+    Pivots are taken in the order columns are added and free variables are set to
+    0, so `solution` is a basic solution: its reactions are linearly independent and
+    none of them can be dropped. Every row also records which combination of the
+    original species rows it is, so the columns of a new layer are brought straight
+    into the reduced form instead of eliminating the earlier columns again.
+    """
+    def __init__(self, columns: list[Stoichiometry], target: Stoichiometry) -> None:
+        self.columns = columns
+        self.rows: list[tuple[dict[int, Fraction], Fraction, dict[str, Fraction]]] = [
+            ({}, Fraction(coefficient), {species: Fraction(1)}) for species, coefficient in target.items()]
+        self.species: set[str] = set(target)
+        self.pivots: list[tuple[int, int]] = []
+        self.pivoted: set[int] = set()
+
+    def add(self, layer: list[int]) -> None:
+        """Adds the columns in `layer` and eliminates them."""
+        entries: dict[str, list[tuple[int, Fraction]]] = {}
+        for j in layer:
+            for species, coefficient in self.columns[j].items():
+                entries.setdefault(species, []).append((j, Fraction(coefficient)))
+                if species not in self.species:
+                    self.species.add(species)
+                    self.rows.append(({}, Fraction(0), {species: Fraction(1)}))
+        for row, _, combination in self.rows:
+            for species, weight in combination.items():
+                for j, coefficient in entries.get(species, ()):
+                    value = row.get(j, 0) + weight * coefficient
+                    if value:
+                        row[j] = value
+                    else:
+                        row.pop(j, None)
+        for j in layer:
+            self._eliminate(j)
+
+    def _eliminate(self, j: int) -> None:
+        pivot = next((r for r, (row, _, _) in enumerate(self.rows) if r not in self.pivoted and row.get(j)), None)
+        if pivot is None:
+            return
+        row, rhs, combination = self.rows[pivot]
+        scale = row[j]
+        row = {k: v / scale for k, v in row.items()}
+        combination = {k: v / scale for k, v in combination.items()}
+        rhs /= scale
+        self.rows[pivot] = (row, rhs, combination)
+        for r, (other, other_rhs, other_combination) in enumerate(self.rows):
+            factor = other.get(j)
+            if r == pivot or not factor:
+                continue
+            _subtract(other, row, factor)
+            _subtract(other_combination, combination, factor)
+            self.rows[r] = (other, other_rhs - factor * rhs, other_combination)
+        self.pivots.append((j, pivot))
+        self.pivoted.add(pivot)
+
+    def solution(self) -> Optional[dict[int, Fraction]]:
+        """Returns the weights of a basic solution, or `None` if the target is not a combination of the columns so far."""
+        if any(rhs for r, (_, rhs, _) in enumerate(self.rows) if r not in self.pivoted):
+            return None
+        return {j: self.rows[r][1] for j, r in self.pivots if self.rows[r][1]}
+
+
+def _least_squares(columns: list[Stoichiometry], order: list[int], target: Stoichiometry) -> tuple[dict[int, float], float]:
+    """Returns the least-squares weights of the `order` columns and the residual norm, using scipy's sparse LSQR when available."""
+    import numpy as np
+    species = {s: i for i, s in enumerate(sorted(set(target).union(*(columns[j] for j in order))))}
+    entries = [(species[s], c, coefficient) for c, j in enumerate(order) for s, coefficient in columns[j].items()]
+    rows, cols, data = (np.array(values) for values in zip(*entries))
+    b = np.zeros(len(species))
+    for s, coefficient in target.items():
+        b[species[s]] = coefficient
+    try:
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.linalg import lsqr
+    except ImportError:
+        A = np.zeros((len(species), len(order)))
+        np.add.at(A, (rows, cols), data)
+        solution = np.linalg.lstsq(A, b, rcond=None)[0]
+    else:
+        A = csr_matrix((data.astype(float), (rows, cols)), shape=(len(species), len(order)))
+        solution = lsqr(A, b, atol=1e-12, btol=1e-12)[0]
+    residual = float(np.linalg.norm(A @ solution - b))
+    return {j: float(w) for j, w in zip(order, solution) if abs(w) > 1e-12}, residual
+
+
+def solve_hess(target: Equation | Equation2,
+               reactions: Sequence[Equation | Equation2] | ReactionLibrary) -> HessSolution:
+    """
+    Finds reactions among `reactions` that add up to the balanced `target` and returns the resulting enthalpy.
+
+    Reactions without an `h_rxn` are ignored. Starting from the species of `target`,
+    reactions are considered in breadth-first order over shared species, one layer
+    at a time, and the first layer at which `target` becomes an exact rational
+    combination yields a basic solution using only the reactions it needs. If no
+    exact combination exists, the least-squares combination over every reachable
+    reaction is returned with its residual.
+    """
+    columns, h_rxns, index = _candidates(reactions)
+    target_column = _stoichiometry(target)
+    elimination = _Elimination(columns, target_column)
+    order: list[int] = []
+    seen_reactions: set[int] = set()
+    seen_species: set[str] = set(target_column)
+    frontier = set(target_column)
+    while frontier:
+        layer = sorted({j for s in frontier for j in index.get(s, ())
+                        if j not in seen_reactions and h_rxns[j] is not None})
+        if not layer:
+            break
+        seen_reactions.update(layer)
+        order.extend(layer)
+        elimination.add(layer)
+        weights = elimination.solution()
+        if weights is not None:
+            h_rxn = sum(w * Fraction(h_rxns[j]) for j, w in weights.items())
+            return HessSolution(float(h_rxn), {j: float(w) for j, w in weights.items()}, 0.0, True)
+        frontier = {s for j in layer for s in columns[j]} - seen_species
+        seen_species |= frontier
+    if not order:
+        raise ValueError('No reaction with a known `h_rxn` shares a species with the target reaction.')
+    weights, residual = _least_squares(columns, order, target_column)
+    return HessSolution(sum(w * h_rxns[j] for j, w in weights.items()), weights, residual, False)
+
+
 class Hess_Law:
     def __init__(self, initial_eq: tuple[Equation, Optional[float | int]],
                 intermediate_equations: list[tuple[Equation, Optional[float | int]]],
@@ -31,25 +210,16 @@ class Hess_Law:
             intermediate_eq.h_rxn = h_rxn
             intermediate_eq.balance()
         self.intermediate_equations = [eq for eq, _ in intermediate_equations]
-        self.unique_compounds = set(compound 
-                                    for eq in self.intermediate_equations + [self.initial_eq] + [self.desired_equation]
-                                    for compound in eq.compounds)
         self.new_h_rxn = self._get_new_enthalpy()
 
 
     def _get_new_enthalpy(self) -> Optional[int | float]:
-        self.A = []
-        self.B = []
-        self.h_rxns = np.array([equation.h_rxn for equation in [self.initial_eq] + self.intermediate_equations])
-        for compound in self.unique_compounds:
-            row: list[int] = []
-            for equation in [self.initial_eq] + self.intermediate_equations:
-                matching_coefficient = equation._matching_coefficient(compound)
-                row.append(matching_coefficient)
-            self.A.append(row)
-            self.B.append([self.desired_equation._matching_coefficient(compound)])
-        self.solution = np.linalg.lstsq(self.A, self.B, rcond=None)[0].T[0]
-        return np.sum(self.solution * self.h_rxns)
+        equations = [self.initial_eq] + self.intermediate_equations
+        self.h_rxns = [equation.h_rxn for equation in equations]
+        self.hess_solution = solve_hess(self.desired_equation, equations)
+        self.solution = [self.hess_solution.weights.get(i, 0.0) for i in range(len(equations))]
+        self.residual = self.hess_solution.residual
+        return self.hess_solution.h_rxn
 
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}(({self.initial_eq}, {self.initial_h_rxn}), {",".join((f"[{eq.__repr__()}, {eq.h_rxn}]" for eq in self.intermediate_equations))}, {self.desired_equation.__repr__()})'
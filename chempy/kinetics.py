@@ -0,0 +1,136 @@
+"""
+Vectorized integrated rate laws.
+
+Every function broadcasts over NumPy arrays (or scalars) of orders, rate
+constants, concentrations and times, so whole grids of conditions are
+evaluated in one call. Orders need not be integers: the general n-th order law
+
+    [A]^(1 - n) = [A]0^(1 - n) + (n - 1) k t        (n != 1)
+    [A]         = [A]0 exp(-k t)                    (n == 1)
+
+covers zero (n = 0) and second (n = 2) order as special cases.
+
+    >>> concentration_at_time(order=1, k=0.5, initial=2.0, time=[0, 1, 2])
+    array([2.        , 1.21306132, 0.73575888])
+"""
+from collections.abc import Sequence
+from typing import NamedTuple
+import numpy as np
+
+
+type ArrayLike = float | Sequence[float] | np.ndarray
+
+
+def _check_order(order: np.ndarray) -> None:
+    if np.any(order < 0):
+        raise ValueError(f'Expected non-negative reaction orders but received `{order!r}` instead.')
+
+
+def _integrated(order: np.ndarray, concentration: np.ndarray) -> np.ndarray:
+    """Returns the quantity that grows by `k` per unit time: `-ln [A]` for first order, `[A]^(1 - n) / (n - 1)` otherwise."""
+    first = order == 1
+    exponent = np.where(first, 0.0, 1 - order)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(first, -np.log(concentration), concentration ** exponent / np.where(first, 1.0, -exponent))
+
+
+def rate_constant(rate: ArrayLike, concentrations: ArrayLike, orders: ArrayLike) -> np.ndarray:
+    """
+    Returns `k = rate / prod([X_i] ** order_i)`.
+
+    The last axis of `concentrations` runs over the species, matching `orders`.
+    """
+    concentrations = np.asarray(concentrations, dtype=np.float64)
+    orders = np.asarray(orders, dtype=np.float64)
+    return np.asarray(rate, dtype=np.float64) / np.prod(concentrations ** orders, axis=-1)
+
+
+def concentration_at_time(order: ArrayLike, k: ArrayLike, initial: ArrayLike, time: ArrayLike) -> np.ndarray:
+    """Returns the concentration after `time`; reactions below first order stop at 0 once the reactant is used up."""
+    order, k, initial, time = np.broadcast_arrays(*(np.asarray(value, dtype=np.float64)
+                                                    for value in (order, k, initial, time)))
+    _check_order(order)
+    first = order == 1
+    exponent = np.where(first, 1.0, 1 - order)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        base = np.maximum(initial ** exponent - exponent * k * time, 0.0)
+        general = base ** (1 / exponent)
+        return np.where(first, initial * np.exp(-k * time), general)
+
+
+def time_at_concentration(order: ArrayLike, k: ArrayLike, initial: ArrayLike, concentration: ArrayLike) -> np.ndarray:
+    """Returns the time at which the concentration falls from `initial` to `concentration`."""
+    order = np.asarray(order, dtype=np.float64)
+    _check_order(order)
+    initial = np.asarray(initial, dtype=np.float64)
+    concentration = np.asarray(concentration, dtype=np.float64)
+    return (_integrated(order, concentration) - _integrated(order, initial)) / np.asarray(k, dtype=np.float64)
+
+
+def rate_constant_from_time(order: ArrayLike, initial: ArrayLike, time: ArrayLike, concentration: ArrayLike) -> np.ndarray:
+    """Returns the rate constant at which the concentration falls from `initial` to `concentration` in `time`."""
+    return time_at_concentration(order, 1.0, initial, concentration) / np.asarray(time, dtype=np.float64)
+
+
+def half_life(order: ArrayLike, k: ArrayLike, initial: ArrayLike = np.nan) -> np.ndarray:
+    """
+    Returns the half-life `(2^(n - 1) - 1) / ((n - 1) k [A]0^(n - 1))`, or `ln 2 / k` for first order.
+
+    `initial` is only needed for orders other than 1.
+    """
+    order, k, initial = np.broadcast_arrays(*(np.asarray(value, dtype=np.float64) for value in (order, k, initial)))
+    _check_order(order)
+    first = order == 1
+    m = np.where(first, 1.0, order - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        general = (2 ** m - 1) / (m * k * np.where(first, 1.0, initial) ** m)
+        return np.where(first, np.log(2) / k, general)
+
+
+def rate_constant_from_half_life(order: ArrayLike, t_half: ArrayLike, initial: ArrayLike = np.nan) -> np.ndarray:
+    """Returns the rate constant giving the half-life `t_half`; the relation is symmetric in `k` and the half-life."""
+    return half_life(order, t_half, initial)
+
+
+class RateFit(NamedTuple):
+    """Rate constants fitted to concentration series, with the fitted initial concentration and the R² of the linearized fit."""
+    k: np.ndarray
+    initial: np.ndarray
+    r_squared: np.ndarray
+
+
+def fit_rate_constant(times: ArrayLike, concentrations: ArrayLike, order: float) -> RateFit:
+    """
+    Fits the rate constant of every concentration series by linear least squares on the integrated rate law.
+
+    The last axis of `times` and `concentrations` runs over the samples of a series;
+    any leading axes are batch dimensions, so many experiments are fitted at once.
+    """
+    order_array = np.asarray(order, dtype=np.float64)
+    _check_order(order_array)
+    times, concentrations = np.broadcast_arrays(np.asarray(times, dtype=np.float64),
+                                                np.asarray(concentrations, dtype=np.float64))
+    y = _integrated(order_array, concentrations)
+    t_mean = times.mean(axis=-1, keepdims=True)
+    y_mean = y.mean(axis=-1, keepdims=True)
+    dt = times - t_mean
+    dy = y - y_mean
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = (dt * dy).sum(axis=-1) / (dt * dt).sum(axis=-1)
+        intercept = y_mean[..., 0] - k * t_mean[..., 0]
+        residual = ((dy - k[..., None] * dt) ** 2).sum(axis=-1)
+        r_squared = 1 - residual / (dy * dy).sum(axis=-1)
+        if order == 1:
+            initial = np.exp(-intercept)
+        else:
+            initial = np.maximum(intercept * (order - 1), 0.0) ** (1 / (1 - order))
+    return RateFit(k, initial, r_squared)
+
+
+def best_order(times: ArrayLike, concentrations: ArrayLike, orders: Sequence[float] = (0, 1, 2)) -> tuple[np.ndarray, RateFit]:
+    """Fits every order in `orders` to each series and returns the best-fitting order and its fit per series."""
+    fits = [fit_rate_constant(times, concentrations, order) for order in orders]
+    r_squared = np.stack([np.nan_to_num(fit.r_squared, nan=-np.inf) for fit in fits])
+    best = np.argmax(r_squared, axis=0)
+    pick = lambda field: np.choose(best, [getattr(fit, field) for fit in fits])
+    return np.asarray(orders, dtype=np.float64)[best], RateFit(pick('k'), pick('initial'), pick('r_squared'))
@@ -0,0 +1,313 @@
+"""
+Mass-action simulation of coupled reaction networks.
+
+`ReactionNetwork` compiles balanced equations and their rate constants into
+flat index arrays: a sparse stoichiometry matrix (species x reactions), the
+reactant orders of every reaction and the sparsity pattern of the Jacobian.
+Rates, derivatives and the analytic Jacobian are then evaluated with a handful
+of NumPy gathers and scatter-adds, whatever the size of the network.
+
+`simulate` integrates with scipy's stiff BDF solver when scipy is installed and
+with a built-in adaptive implicit Euler solver otherwise, and yields the
+trajectory in chunks so only one chunk is ever held in memory.
+
+    >>> from chempy import Equation
+    >>> network = ReactionNetwork([(Equation.parse_from_string('N2O4 -> 2NO2'), 0.5)])
+    >>> for chunk in network.simulate({'N2O4': 1.0}, [0.0, 1.0, 2.0]):
+    ...     print(chunk.concentrations.round(4))
+    [[1.     0.    ]
+     [0.6065 0.7869]
+     [0.3679 1.2642]]
+"""
+from .compound import Compound
+from .equation import Equation
+from .equation2 import Equation2
+from .reaction_library import species_key
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from itertools import chain, islice
+from typing import NamedTuple, Optional
+import numpy as np
+
+
+class NetworkChunk(NamedTuple):
+    """Consecutive output times and the concentrations of every species at them, shaped `(len(times), species)`."""
+    times: np.ndarray
+    concentrations: np.ndarray
+
+
+def _sides(equation: Equation | Equation2) -> tuple[list[tuple[Compound, int | float]], list[tuple[Compound, int | float]]]:
+    if isinstance(equation, Equation2):
+        return list(equation.reactants.items()), list(equation.products.items())
+    if isinstance(equation, Equation):
+        return ([(c, c.coefficient) for c in equation.reactants], [(c, c.coefficient) for c in equation.products])
+    raise TypeError('Expected `Equation` or `Equation2` for `equation` argument but received '
+                    f'`{equation.__class__.__name__}` instead.')
+
+
+MIN_STEP = 1e-12
+
+
+def _step_solver(jacobian, h: float) -> Callable[[np.ndarray], np.ndarray]:
+    """Returns a function solving `(I - h J) x = b`, factorizing a sparse `J` once and solving a dense one per call."""
+    if isinstance(jacobian, np.ndarray):
+        matrix = np.eye(len(jacobian)) - h * jacobian
+        return lambda b: np.linalg.solve(matrix, b)
+    from scipy.sparse import identity
+    from scipy.sparse.linalg import splu
+    return splu((identity(jacobian.shape[0], format='csc') - h * jacobian).tocsc()).solve
+
+
+class ReactionNetwork:
+    """
+    A set of elementary reactions with mass-action kinetics.
+
+    Each reaction's rate is `k * prod(c_i ** a_i)` over its reactants, where `a_i`
+    are the reactant coefficients. Species are identified by canonical formula and
+    listed in `species` in order of first appearance.
+    """
+    def __init__(self, reactions: Iterable[tuple[Equation | Equation2, float]]) -> None:
+        self.species: list[str] = []
+        self._index: dict[str, int] = {}
+        rate_constants: list[float] = []
+        stoich: dict[tuple[int, int], float] = {}
+        reactant_rows, reactant_species, reactant_orders = [], [], []
+        for r, (equation, k) in enumerate(reactions):
+            rate_constants.append(float(k))
+            reactants, products = _sides(equation)
+            for compound, coefficient in reactants:
+                s = self._species(compound)
+                reactant_rows.append(r)
+                reactant_species.append(s)
+                reactant_orders.append(float(coefficient))
+                stoich[(s, r)] = stoich.get((s, r), 0) - coefficient
+            for compound, coefficient in products:
+                s = self._species(compound)
+                stoich[(s, r)] = stoich.get((s, r), 0) + coefficient
+        self.rate_constants = np.array(rate_constants, dtype=np.float64)
+        entries = [(s, r, v) for (s, r), v in stoich.items() if v]
+        self._stoich_species = np.array([s for s, _, _ in entries], dtype=np.int64)
+        self._stoich_reactions = np.array([r for _, r, _ in entries], dtype=np.int64)
+        self._stoich_values = np.array([v for _, _, v in entries], dtype=np.float64)
+        self._reactant_rows = np.array(reactant_rows, dtype=np.int64)
+        self._reactant_species = np.array(reactant_species, dtype=np.int64)
+        self._reactant_orders = np.array(reactant_orders, dtype=np.float64)
+        self._compile_jacobian()
+
+    def _species(self, compound: Compound) -> int:
+        key = compound.composition.formula
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.species)
+            self.species.append(key)
+        return index
+
+    def _compile_jacobian(self) -> None:
+        """Precomputes which reactant terms multiply each other and where each stoichiometry/reactant pair lands in the Jacobian."""
+        by_reaction: dict[int, list[int]] = {}
+        for e, r in enumerate(self._reactant_rows.tolist()):
+            by_reaction.setdefault(r, []).append(e)
+        pairs = [(e, other) for entries in by_reaction.values() for e in entries for other in entries if e != other]
+        self._other_entry = np.array([e for e, _ in pairs], dtype=np.int64)
+        self._other_term = np.array([other for _, other in pairs], dtype=np.int64)
+        stoich_by_reaction: dict[int, list[int]] = {}
+        for e, r in enumerate(self._stoich_reactions.tolist()):
+            stoich_by_reaction.setdefault(r, []).append(e)
+        slots: dict[tuple[int, int], int] = {}
+        jac_stoich, jac_reactant, jac_slot = [], [], []
+        for r, reactant_entries in by_reaction.items():
+            for i in stoich_by_reaction.get(r, ()):
+                row = int(self._stoich_species[i])
+                for e in reactant_entries:
+                    column = int(self._reactant_species[e])
+                    jac_slot.append(slots.setdefault((row, column), len(slots)))
+                    jac_stoich.append(i)
+                    jac_reactant.append(e)
+        self._jac_stoich = np.array(jac_stoich, dtype=np.int64)
+        self._jac_reactant = np.array(jac_reactant, dtype=np.int64)
+        self._jac_slot = np.array(jac_slot, dtype=np.int64)
+        self._jac_rows = np.array([row for row, _ in slots], dtype=np.int64)
+        self._jac_columns = np.array([column for _, column in slots], dtype=np.int64)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(species={len(self.species)}, reactions={len(self.rate_constants)})'
+
+    def stoichiometry_matrix(self):
+        """Returns the `(species, reactions)` net stoichiometry as a `scipy.sparse.csr_matrix` (requires scipy)."""
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self._stoich_values, (self._stoich_species, self._stoich_reactions)),
+                          shape=(len(self.species), len(self.rate_constants)))
+
+    def state(self, concentrations: Mapping[str | Compound, float]) -> np.ndarray:
+        """Returns a concentration vector from a mapping of formulas to concentrations; unlisted species start at 0."""
+        state = np.zeros(len(self.species))
+        for species, concentration in concentrations.items():
+            key = species_key(species)
+            if key not in self._index:
+                raise ValueError(f'`{key}` is not a species of this network.')
+            state[self._index[key]] = concentration
+        return state
+
+    def _terms(self, concentrations: np.ndarray) -> np.ndarray:
+        return concentrations[self._reactant_species] ** self._reactant_orders
+
+    def rates(self, concentrations: np.ndarray) -> np.ndarray:
+        """Returns the rate of every reaction."""
+        rates = self.rate_constants.copy()
+        np.multiply.at(rates, self._reactant_rows, self._terms(concentrations))
+        return rates
+
+    def derivatives(self, t: float, concentrations: np.ndarray) -> np.ndarray:
+        """Returns `dc/dt`, the stoichiometry matrix applied to the reaction rates."""
+        rates = self.rates(concentrations)
+        return np.bincount(self._stoich_species, weights=self._stoich_values * rates[self._stoich_reactions],
+                           minlength=len(self.species))
+
+    def _jacobian_values(self, concentrations: np.ndarray) -> np.ndarray:
+        others = np.ones(len(self._reactant_rows))
+        np.multiply.at(others, self._other_entry, self._terms(concentrations)[self._other_term])
+        orders = self._reactant_orders
+        partials = (self.rate_constants[self._reactant_rows] * orders
+                    * concentrations[self._reactant_species] ** (orders - 1) * others)
+        return np.bincount(self._jac_slot, weights=self._stoich_values[self._jac_stoich] * partials[self._jac_reactant],
+                           minlength=len(self._jac_rows))
+
+    def jacobian(self, t: float, concentrations: np.ndarray, sparse: bool = True):
+        """Returns the analytic Jacobian `d(dc/dt)/dc`, as a `scipy.sparse.csc_matrix` or (with `sparse=False`) a dense array."""
+        values = self._jacobian_values(concentrations)
+        shape = (len(self.species), len(self.species))
+        if sparse:
+            from scipy.sparse import csc_matrix
+            return csc_matrix((values, (self._jac_rows, self._jac_columns)), shape=shape)
+        dense = np.zeros(shape)
+        dense[self._jac_rows, self._jac_columns] = values
+        return dense
+
+    def simulate(self,
+                 initial: Mapping[str | Compound, float] | np.ndarray,
+                 times: Iterable[float],
+                 chunksize: int = 1024,
+                 rtol: float = 1e-6,
+                 atol: float = 1e-10,
+                 solver: Optional[str] = None) -> Iterator[NetworkChunk]:
+        """
+        Integrates the network from `initial` at the first of `times` and yields the concentrations at every time.
+
+        `times` must be increasing and is consumed lazily, `chunksize` at a time.
+        `solver` is `'scipy'` (BDF with the sparse Jacobian), `'builtin'` (adaptive
+        implicit Euler; first order, so much slower at tight tolerances) or `None` to
+        use scipy when it is installed.
+        """
+        state = initial if isinstance(initial, np.ndarray) else self.state(initial)
+        state = np.asarray(state, dtype=np.float64).copy()
+        if not np.all(np.isfinite(state)):
+            raise ValueError('Expected finite initial concentrations.')
+        times = iter(times)
+        first = next(times, None)
+        if first is None:
+            return
+        if solver is None:
+            try:
+                import scipy.integrate  # noqa: F401
+                solver = 'scipy'
+            except ImportError:
+                solver = 'builtin'
+        if solver not in ('scipy', 'builtin'):
+            raise ValueError(f"Expected `'scipy'`, `'builtin'` or `None` for `solver` argument but received `{solver!r}` instead.")
+        step = self._scipy_stepper if solver == 'scipy' else self._builtin_stepper
+        advance = step(float(first), state, rtol, atol)
+        next(advance)
+        last = float(first)
+        pending = [last]
+        while True:
+            pending.extend(float(t) for t in islice(times, chunksize - len(pending)))
+            if not pending:
+                return
+            # Compared against the last time of the previous chunk too, so the check spans chunk boundaries.
+            if any(b < a for a, b in zip(chain((last,), pending), pending)):
+                raise ValueError('Expected increasing `times`.')
+            outputs = np.array([advance.send(t) for t in pending])
+            yield NetworkChunk(np.array(pending), outputs)
+            if len(pending) < chunksize:
+                return
+            last = pending[-1]
+            pending = []
+
+    def _scipy_stepper(self, t0: float, y0: np.ndarray, rtol: float, atol: float):
+        """A coroutine that receives output times and returns the state at each, stepping scipy's BDF solver as far as needed."""
+        from scipy.integrate import BDF
+        solver = None
+        target = yield
+        while True:
+            if target <= t0:
+                target = yield y0.copy()
+                continue
+            if solver is None:
+                solver = BDF(self.derivatives, t0, y0, np.inf, rtol=rtol, atol=atol,
+                             jac=lambda t, y: self.jacobian(t, y))
+            while solver.t < target:
+                message = solver.step()
+                if solver.status == 'failed':
+                    raise RuntimeError(f'Integration failed at t={solver.t}: {message}')
+            target = yield solver.dense_output()(target)
+
+    def _builtin_stepper(self, t0: float, y0: np.ndarray, rtol: float, atol: float):
+        """
+        A coroutine like `_scipy_stepper` using implicit Euler with step doubling for error control.
+
+        Steps are sized by the error estimate alone and output times between two
+        accepted steps are interpolated linearly. The Jacobian is evaluated once per
+        step, and the Newton systems are solved with a sparse LU factorization when
+        scipy is installed and with dense solves otherwise. Like the scipy path, it
+        raises `RuntimeError` once the step shrinks below `MIN_STEP` (relative to `t`).
+        """
+        try:
+            import scipy.sparse.linalg  # noqa: F401
+            sparse = True
+        except ImportError:
+            sparse = False
+        t_previous, y_previous = t0, y0.copy()
+        t, y = t0, y0.copy()
+        h = None
+        target = yield y.copy()
+        while True:
+            if h is None and target > t:
+                h = (target - t) * 1e-3
+            while target > t:
+                if h < MIN_STEP * max(1.0, abs(t)):
+                    raise RuntimeError(f'Integration failed at t={t}: the step size fell below {h:.3g}.')
+                jacobian = self.jacobian(t, y, sparse=sparse)
+                try:
+                    full = self._implicit_euler(t, y, h, _step_solver(jacobian, h), rtol, atol)
+                    solve_half = _step_solver(jacobian, h / 2)
+                    half = None if full is None else self._implicit_euler(t, y, h / 2, solve_half, rtol, atol)
+                    two = None if half is None else self._implicit_euler(t + h / 2, half, h / 2, solve_half, rtol, atol)
+                except (RuntimeError, np.linalg.LinAlgError):
+                    # A singular Newton matrix is treated like a Newton iteration that does not converge.
+                    two = None
+                if two is None:
+                    h /= 4
+                    continue
+                error = np.max(np.abs(two - full) / (atol + rtol * np.abs(two)), initial=0.0)
+                if error <= 1:
+                    t_previous, y_previous, t, y = t, y, t + h, two
+                h *= min(4.0, max(0.2, 0.9 / np.sqrt(error))) if error else 4.0
+            if target <= t_previous:
+                target = yield y_previous.copy()
+            else:
+                weight = (target - t_previous) / (t - t_previous)
+                target = yield y_previous + weight * (y - y_previous)
+
+    def _implicit_euler(self, t: float, y: np.ndarray, h: float, solve: Callable[[np.ndarray], np.ndarray],
+                        rtol: float, atol: float) -> Optional[np.ndarray]:
+        """
+        Solves `x = y + h f(t + h, x)` by Newton iteration with a frozen Jacobian, returning `None` if it does not converge.
+
+        `solve` solves the Newton system `(I - h J) delta = r` (see `_step_solver`).
+        """
+        x = y.copy()
+        for _ in range(8):
+            delta = solve(x - y - h * self.derivatives(t + h, x))
+            x -= delta
+            if np.all(np.abs(delta) <= atol + rtol * np.abs(x)):
+                return x
+        return None
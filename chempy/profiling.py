@@ -0,0 +1,213 @@
+"""
+Opt-in timing of chempy's internal stages.
+
+A `Profiler` wraps the functions behind each stage (formula parsing, compound
+construction, duplicate merging, the coefficient solver, Hess's law and
+rendering) only while it is enabled, and restores the originals afterwards, so
+disabled profiling costs nothing. A snapshot reports call counts, total and
+percentile latencies per stage, and the hits and misses of the parse and render
+caches over the profiled period.
+
+    >>> from chempy import Equation
+    >>> with Profiler() as profiler:
+    ...     Equation.parse_from_string('C3H8 + O2 -> CO2 + H2O').balance()
+    >>> profiler.snapshot().stages['_get_coefficients'].count
+    1
+
+Formulas are counted however they are parsed, including by a direct `tokenize` call:
+
+    >>> from chempy.utils import tokenize
+    >>> with Profiler(['parse_formula']) as profiler:
+    ...     _ = tokenize('CH3COOH')
+    >>> profiler.snapshot().stages['parse_formula'].count
+    1
+"""
+from .utils import CacheInfo
+from collections.abc import Callable, Iterable
+from importlib import import_module
+from threading import Lock
+from time import perf_counter
+from typing import Any, NamedTuple, Optional, Self
+import functools
+
+
+STAGES: dict[str, tuple[tuple[str, str], ...]] = {
+    # `tokenize` reaches `parse_formula` through its module's global, so patching it there counts direct calls too.
+    'parse_formula': (('chempy.compound', 'parse_formula'), ('chempy.utils.tokenize', 'parse_formula')),
+    'Compound.__init__': (('chempy.compound', 'Compound.__init__'),),
+    'merge_duplicate_compounds': (('chempy.equation', 'merge_duplicate_compounds'),),
+    'balance_coefficients': (('chempy.equation', 'balance_coefficients'), ('chempy.equation2', 'balance_coefficients')),
+    '_get_coefficients': (('chempy.equation', 'Equation._get_coefficients'),
+                          ('chempy.equation2', 'Equation2._get_coefficients')),
+    'Hess_Law._get_new_enthalpy': (('chempy.hess_law', 'Hess_Law._get_new_enthalpy'),),
+    '_equation': (('chempy.equation', 'Equation._equation'), ('chempy.equation2', 'Equation2._equation')),
+}
+
+CACHES: dict[str, tuple[str, str]] = {
+    'parse': ('chempy.compound', 'PARSE_CACHE'),
+    'render': ('chempy.render', 'RENDER_CACHE'),
+}
+
+_active_lock = Lock()
+_active: Optional['Profiler'] = None
+
+
+class StageStats(NamedTuple):
+    """Call count and latencies (seconds) of one stage. Calls of nested stages are included in their callers' times."""
+    count: int
+    total: float
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+class ProfileSnapshot(NamedTuple):
+    """Statistics of every stage that ran, and the cache activity over the profiled period."""
+    stages: dict[str, StageStats]
+    caches: dict[str, CacheInfo]
+
+    def format(self) -> str:
+        """Returns the snapshot as a table, slowest stage first, with times in microseconds."""
+        lines = [f'{"stage":<28}{"calls":>8}{"total":>12}{"mean":>10}{"p50":>10}{"p90":>10}{"p99":>10}']
+        for name, stats in sorted(self.stages.items(), key=lambda item: -item[1].total):
+            lines.append(f'{name:<28}{stats.count:>8}' + ''.join(
+                f'{value * 1e6:>{width}.1f}'
+                for value, width in ((stats.total, 12), (stats.mean, 10), (stats.p50, 10), (stats.p90, 10), (stats.p99, 10))))
+        for name, info in self.caches.items():
+            lines.append(f'{name} cache: {info.hits} hits, {info.misses} misses, {info.currsize}/{info.maxsize} entries')
+        return '\n'.join(lines)
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _stats(samples: list[float]) -> StageStats:
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return StageStats(len(ordered), total, total / len(ordered), _percentile(ordered, 0.5),
+                      _percentile(ordered, 0.9), _percentile(ordered, 0.99), ordered[-1])
+
+
+def _resolve(module_name: str, path: str) -> tuple[Any, str]:
+    """
+    Returns the object owning the attribute at `path` in `module_name`, and the attribute name.
+
+    Modules are looked up with `import_module` rather than as attributes of their
+    package, since `chempy.utils.tokenize` is shadowed there by the function it defines.
+    """
+    owner = import_module(module_name)
+    *parents, name = path.split('.')
+    for parent in parents:
+        owner = getattr(owner, parent)
+    return owner, name
+
+
+def _timed(func: Callable, samples: list[float]) -> Callable:
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            samples.append(perf_counter() - start)
+    return timed
+
+
+class Profiler:
+    """
+    Times the named `stages` (all of `STAGES` by default) while enabled.
+
+    Only one profiler can be enabled at a time, since enabling patches the
+    module-level functions and methods behind each stage. Samples accumulate
+    across enable/disable cycles until `reset`.
+    """
+    def __init__(self, stages: Optional[Iterable[str]] = None) -> None:
+        stages = list(STAGES) if stages is None else list(stages)
+        unknown = [stage for stage in stages if stage not in STAGES]
+        if unknown:
+            raise ValueError(f'Unknown stage(s) {unknown}; expected any of {list(STAGES)}.')
+        self.stages = stages
+        self._samples: dict[str, list[float]] = {stage: [] for stage in stages}
+        self._patches: list[tuple[Any, str, Any]] = []
+        self._cache_start: dict[str, CacheInfo] = {}
+        self._cache_totals: dict[str, tuple[int, int]] = {name: (0, 0) for name in CACHES}
+
+    @property
+    def enabled(self) -> bool:
+        return _active is self
+
+    def enable(self) -> None:
+        global _active
+        with _active_lock:
+            if _active is self:
+                return
+            if _active is not None:
+                raise RuntimeError('Another Profiler is already enabled.')
+            _active = self
+        try:
+            for stage in self.stages:
+                for module_name, path in STAGES[stage]:
+                    owner, name = _resolve(module_name, path)
+                    original = owner.__dict__[name] if isinstance(owner, type) else getattr(owner, name)
+                    self._patches.append((owner, name, original))
+                    setattr(owner, name, _timed(original, self._samples[stage]))
+        except BaseException:
+            self.disable()
+            raise
+        self._cache_start = {name: getattr(import_module(module), attribute).info()
+                             for name, (module, attribute) in CACHES.items()}
+
+    def disable(self) -> None:
+        global _active
+        if _active is not self:
+            return
+        self._cache_totals = self._cache_deltas()
+        self._cache_start = {}
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+        self._patches.clear()
+        with _active_lock:
+            _active = None
+
+    def _cache_deltas(self) -> dict[str, tuple[int, int]]:
+        totals = dict(self._cache_totals)
+        for name, start in self._cache_start.items():
+            module, attribute = CACHES[name]
+            info = getattr(import_module(module), attribute).info()
+            hits, misses = totals[name]
+            # A cleared cache resets its counters; count from zero in that case.
+            base_hits, base_misses = (start.hits, start.misses) if info.hits >= start.hits and info.misses >= start.misses else (0, 0)
+            totals[name] = (hits + info.hits - base_hits, misses + info.misses - base_misses)
+        return totals
+
+    def reset(self) -> None:
+        """Discards every sample and cache count collected so far."""
+        for samples in self._samples.values():
+            samples.clear()
+        self._cache_totals = {name: (0, 0) for name in CACHES}
+        if self.enabled:
+            self._cache_start = {name: getattr(import_module(module), attribute).info()
+                                 for name, (module, attribute) in CACHES.items()}
+
+    def snapshot(self) -> ProfileSnapshot:
+        """Returns the statistics collected so far; stages that never ran are left out."""
+        stages = {stage: _stats(list(samples)) for stage, samples in self._samples.items() if samples}
+        caches = {}
+        for name, (hits, misses) in self._cache_deltas().items():
+            module, attribute = CACHES[name]
+            info = getattr(import_module(module), attribute).info()
+            caches[name] = CacheInfo(hits, misses, info.maxsize, info.currsize)
+        return ProfileSnapshot(stages, caches)
+
+    def __enter__(self) -> Self:
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(stages={self.stages}, enabled={self.enabled})'
@@ -1,5 +1,7 @@
+from functools import cache
 from typing import Optional
-from .data import MAX_SUBSHELL, SUBSHELL_MAP, SPECIAL_SUBSHELLS
+from .data import MAX_SUBSHELL, SUBSHELL_MAP, SPECIAL_SUBSHELLS, periodic_table
+from .data.periodic_table import Orbitals
 from .orbital import Orbital
 
 
@@ -26,7 +28,7 @@ def get_special_orbitals(
     return matches
 
 
-def get_electron_config(
+def compute_electron_config(
         protons: int,
         pqn: int = 1,
         left_over: Optional[list[Orbital]] = None,
@@ -101,7 +103,57 @@ def get_electron_config(
 
     new_left_overs += _left_over or []
 
-    return get_electron_config(protons, pqn+1, new_left_overs, e_config, count)
+    return compute_electron_config(protons, pqn+1, new_left_overs, e_config, count)
+
+
+@cache
+def electron_config_table() -> tuple[Orbitals, ...]:
+    """Returns the ground-state configuration of every element as `(n, l, electrons)` triples, indexed by `protons - 1`."""
+    table = periodic_table()
+    return tuple(table.electron_config(protons) for protons in range(1, table.count + 1))
+
+
+def verify_electron_config_table() -> list[int]:
+    """Returns the atomic numbers whose tabulated configuration differs from `compute_electron_config` (empty when the table is consistent)."""
+    return [
+        protons for protons, e_cfg in enumerate(electron_config_table(), start=1)
+        if e_cfg != tuple((o.n, o.l, o.electrons) for o in compute_electron_config(protons))
+    ]
+
+
+@cache
+def electron_config_tuples(protons: int, charge: int = 0) -> Orbitals:
+    """
+    Returns the electron configuration of an atom or ion as `(n, l, electrons)` triples.
+
+    Cations lose electrons from the highest `n` first, and from the highest `l`
+    within it (so transition metals lose their `s` electrons before `d`). Anions
+    take the configuration of the neutral atom with the same electron count.
+    """
+    table = electron_config_table()
+    if not isinstance(protons, int) or not 1 <= protons <= len(table):
+        raise ValueError(f'Expected an atomic number between 1 and {len(table)} but received `{protons!r}` instead.')
+    electrons = protons - charge
+    if electrons < 0:
+        raise ValueError(f'A charge of {charge:+} removes more electrons than an atom with {protons} protons has.')
+    if charge <= 0:
+        if electrons > len(table):
+            raise ValueError(f'No tabulated configuration has {electrons} electrons.')
+        return table[electrons - 1] if electrons else ()
+    e_cfg = [list(orbital) for orbital in table[protons - 1]]
+    removed = 0
+    for orbital in sorted(e_cfg, key=lambda o: (o[0], o[1]), reverse=True):
+        taken = min(orbital[2], charge - removed)
+        orbital[2] -= taken
+        removed += taken
+        if removed == charge:
+            break
+    return tuple((n, l, e) for n, l, e in e_cfg if e)
+
+
+def get_electron_config(protons: int, charge: int = 0) -> list[Orbital]:
+    """Returns the electron configuration of an atom or ion (see `electron_config_tuples`) as new `Orbital`s."""
+    return [Orbital(n, l, electrons) for n, l, electrons in electron_config_tuples(protons, charge)]
 
 
 def calculate_valence(segment: list[Orbital]) -> int:
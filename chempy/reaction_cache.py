@@ -0,0 +1,233 @@
+"""
+A persistent cache of balanced coefficients.
+
+Entries live in a SQLite database keyed by a digest of the canonical reaction:
+the sorted canonical formulas (`Composition.formula`) of each side, so the
+order and spelling of the species do not matter (`O2 + H2 -> H2O` and
+`H2 + O2 -> H2O` share an entry). Only uniquely determined coefficients are
+stored, so a cached answer is the one strict balancing would give. Hits refresh
+the entry's last-used stamp in batches rather than writing on every lookup, and
+once the cache holds more than `max_entries` reactions the least recently used
+are evicted down to 90% of the limit, so eviction runs once per many inserts
+rather than on every one. Workers that start cold read the coefficients back
+instead of calling the solver.
+
+    >>> import os, tempfile
+    >>> from chempy import balance_line
+    >>> cache = ReactionCache(os.path.join(tempfile.mkdtemp(), 'balanced.db'))
+    >>> balance_line('H2 + O2 -> H2O', cache=cache).coefficients
+    [2, 1, 2]
+    >>> balance_line('O2 + H2 -> H2O', cache=cache).coefficients  # served from the cache
+    [1, 2, 2]
+    >>> cache.info().hits
+    1
+
+An underdetermined reaction is never cached, so a strict caller still gets the
+error after a non-strict caller balanced it:
+
+    >>> cache.balance(Equation.parse_from_string('H2 + O2 -> H2O + H2O2'))
+    False
+    >>> balance_line('H2 + O2 -> H2O + H2O2', cache=cache).error
+    'UnderdeterminedEquationError: Underdetermined equation: 2 independent reactions balance it.'
+    >>> len(cache)
+    1
+"""
+from .equation import Equation
+from .equation2 import Equation2
+from .utils import BalanceError, CacheInfo
+from .utils.database import BALANCED_SCHEMA, connect, transaction
+from hashlib import blake2b
+from typing import Optional
+import json
+import os
+import time
+
+
+def _sides(equation: Equation | Equation2) -> tuple[list[tuple[str, int | float]], list[tuple[str, int | float]]]:
+    """Returns each side as `(canonical formula, coefficient)` pairs sorted by formula."""
+    if isinstance(equation, Equation2):
+        sides = (equation.reactants.items(), equation.products.items())
+    elif isinstance(equation, Equation):
+        sides = (((c, c.coefficient) for c in equation.reactants), ((c, c.coefficient) for c in equation.products))
+    else:
+        raise TypeError('Expected `Equation` or `Equation2` for `equation` argument but received '
+                        f'`{equation.__class__.__name__}` instead.')
+    reactants, products = (sorted((compound.composition.formula, coefficient) for compound, coefficient in side)
+                           for side in sides)
+    return reactants, products
+
+
+def canonical_reaction(equation: Equation | Equation2) -> str:
+    """Returns the order-independent form of `equation`'s species, e.g. `H2 + O2 -> H2O`, ignoring coefficients."""
+    return ' -> '.join(' + '.join(formula for formula, _ in side) for side in _sides(equation))
+
+
+def apply_coefficients(equation: Equation | Equation2, coefficients: list[list[int | float]]) -> None:
+    """Sets the coefficients of `equation` from `[reactants, products]` lists in canonical (formula-sorted) order."""
+    if isinstance(equation, Equation2):
+        for counter, values in zip((equation.reactants, equation.products), coefficients):
+            for compound, value in zip(sorted(counter, key=lambda c: c.composition.formula), values):
+                counter[compound] = value
+        equation.compounds = equation._compounds()
+    else:
+        for side, values in zip((equation.reactants, equation.products), coefficients):
+            for compound, value in zip(sorted(side, key=lambda c: c.composition.formula), values):
+                compound.coefficient = value
+        equation.coefficients = [f'{compound.coefficient:,}' for compound in equation.compounds]
+    equation.equation = equation._equation()
+
+
+TOUCH_BATCH = 256
+
+
+def _is_balanced(equation: Equation | Equation2) -> bool:
+    if isinstance(equation, Equation2):
+        return equation.reactants.is_equal(equation.products)
+    return equation.get_is_balanced()
+
+
+class ReactionCache:
+    """
+    Balanced coefficients stored in the SQLite database at `path`, keyed by canonical reaction.
+
+    The connection is opened on first use in each process, so a cache can be handed
+    to worker processes (it pickles as its path and limit). `max_entries=None`
+    disables eviction.
+    """
+    def __init__(self, path: str, max_entries: Optional[int] = 100_000) -> None:
+        if max_entries is not None and (not isinstance(max_entries, int) or max_entries < 1):
+            raise ValueError(f'Expected a positive `int` or `None` for `max_entries` argument but received `{max_entries!r}` instead.')
+        self.path = os.fspath(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._pid: Optional[int] = None
+        self._size = 0
+        self._touched: dict[bytes, float] = {}
+
+    def __reduce__(self):
+        return (self.__class__, (self.path, self.max_entries))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.path!r}, max_entries={self.max_entries})'
+
+    def _connect(self):
+        if self._connection is None or self._pid != os.getpid():
+            connection = connect(self.path, BALANCED_SCHEMA, shared=True)
+            self._size = connection.execute('SELECT COUNT(*) FROM balanced').fetchone()[0]
+            self._touched = {}
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    @staticmethod
+    def _digest(reaction: str) -> bytes:
+        return blake2b(reaction.encode(), digest_size=16).digest()
+
+    def _lookup(self, equation: Equation | Equation2) -> tuple[bytes, Optional[list[list[int | float]]]]:
+        digest = self._digest(canonical_reaction(equation))
+        row = self._connect().execute('SELECT coefficients FROM balanced WHERE digest = ?', (digest,)).fetchone()
+        return digest, None if row is None else json.loads(row[0])
+
+    def _touch(self, digest: bytes) -> None:
+        """Marks the entry as used; the stamps are written `TOUCH_BATCH` at a time so hits rarely take the write lock."""
+        self._touched[digest] = time.time()
+        if len(self._touched) >= TOUCH_BATCH:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._touched:
+            return
+        connection = self._connect()
+        with transaction(connection):
+            connection.executemany('UPDATE balanced SET last_used = ? WHERE digest = ?',
+                                   ((stamp, digest) for digest, stamp in self._touched.items()))
+        self._touched.clear()
+
+    def get(self, equation: Equation | Equation2) -> Optional[list[list[int | float]]]:
+        """Returns the cached `[reactants, products]` coefficients of `equation` in canonical order, or `None`."""
+        digest, coefficients = self._lookup(equation)
+        if coefficients is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touch(digest)
+        return coefficients
+
+    def put(self, equation: Equation | Equation2) -> None:
+        """
+        Stores the coefficients of the balanced `equation`, evicting the least recently used entries beyond `max_entries`.
+
+        The coefficients should be the unique balance of `equation` (as `balance(strict=True)` finds it).
+        """
+        sides = _sides(equation)
+        reaction = ' -> '.join(' + '.join(formula for formula, _ in side) for side in sides)
+        coefficients = json.dumps([[coefficient for _, coefficient in side] for side in sides])
+        digest = self._digest(reaction)
+        connection = self._connect()
+        inserted = connection.execute('INSERT OR IGNORE INTO balanced VALUES (?, ?, ?, ?)',
+                                      (digest, reaction, coefficients, time.time())).rowcount
+        if not inserted:
+            connection.execute('UPDATE balanced SET coefficients = ?, last_used = ? WHERE digest = ?',
+                               (coefficients, time.time(), digest))
+            return
+        self._size += 1
+        if self.max_entries is not None and self._size > self.max_entries:
+            # The size is only an estimate between evictions: other processes may share the file.
+            self._flush()
+            keep = max(1, self.max_entries * 9 // 10)
+            connection.execute('DELETE FROM balanced WHERE digest IN (SELECT digest FROM balanced '
+                               'ORDER BY last_used DESC LIMIT -1 OFFSET ?)', (keep,))
+            self._size = len(self)
+
+    def balance(self, equation: Equation | Equation2, strict: bool = False) -> bool:
+        """
+        Balances `equation` from the cache when possible, and otherwise with `equation.balance`, caching the result.
+
+        Returns whether the coefficients came from the cache. Equations that are
+        already balanced keep their coefficients and are not cached, and neither are
+        underdetermined ones: with `strict=False` they get `equation.balance`'s
+        arbitrary particular solution, which is not the answer for a strict caller.
+        """
+        if _is_balanced(equation):
+            equation.balance(strict=strict)
+            return False
+        digest, coefficients = self._lookup(equation)
+        if coefficients is not None:
+            apply_coefficients(equation, coefficients)
+            if _is_balanced(equation):
+                self.hits += 1
+                self._touch(digest)
+                return True
+        self.misses += 1
+        try:
+            equation.balance(strict=True)
+        except BalanceError:
+            if strict:
+                raise
+            equation.balance()
+            return False
+        self.put(equation)
+        return False
+
+    def __len__(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM balanced').fetchone()[0]
+
+    def info(self) -> CacheInfo:
+        """Returns the hits and misses of this process and the number of stored reactions."""
+        return CacheInfo(self.hits, self.misses, self.max_entries or 0, len(self))
+
+    def clear(self) -> None:
+        """Removes every entry and resets the statistics."""
+        self._connect().execute('DELETE FROM balanced')
+        self._touched.clear()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        """Writes the pending last-used stamps and closes this process's connection."""
+        if self._connection is not None and self._pid == os.getpid():
+            self._flush()
+            self._connection.close()
+        self._connection = None
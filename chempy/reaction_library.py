@@ -0,0 +1,243 @@
+"""
+An indexed, persistable collection of reactions.
+
+Every species is keyed by its canonical formula (`Composition.formula`), so
+`CH3COOH` and `C2H4O2` are the same species. The library keeps inverted indexes
+from species and elements to reactions, answers queries from those indexes alone,
+and only builds `Equation` objects for the reactions a query returns.
+
+    >>> library = ReactionLibrary()
+    >>> library.add(Equation.parse_from_string('C + O2 -> CO2'), h_rxn=-393.5)
+    0
+    >>> library.producing('CO2')
+    [Equation([Compound('C'), Compound('O2')], [Compound('CO2')])]
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'reactions.db')
+    >>> library.save(path)
+    >>> ReactionLibrary.load(path).producing('CO2')[0].h_rxn
+    -393.5
+"""
+from .compound import Compound, parse_compound
+from .equation import Equation
+from .equation2 import Equation2
+from .utils import strip_coefficients
+from .utils.database import LIBRARY_SCHEMA, connect, recreate, transaction
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple, Optional, Self
+import json
+
+
+class ReactionRecord(NamedTuple):
+    """
+    The stored form of one reaction.
+
+    `reactants` and `products` hold each species as written, with its coefficient;
+    `species` holds the net coefficient per canonical formula (negative for reactants).
+    """
+    reactants: tuple[tuple[str, int | float], ...]
+    products: tuple[tuple[str, int | float], ...]
+    h_rxn: Optional[float]
+    species: dict[str, int | float]
+
+
+def species_key(species: str | Compound) -> str:
+    """Returns the canonical formula of a species given as a `Compound` or a formula string."""
+    if isinstance(species, Compound):
+        return species.composition.formula
+    if not isinstance(species, str):
+        raise TypeError('Expected `str` or `Compound` for `species` argument but received '
+                        f'`{species.__class__.__name__}` instead.')
+    return parse_compound(strip_coefficients(species)).composition.formula
+
+
+def _equation_sides(equation: Equation | Equation2) -> tuple[tuple[tuple[str, int | float], ...], ...]:
+    """Returns the `(formula, coefficient)` pairs of each side of `equation`, as written."""
+    if isinstance(equation, Equation2):
+        sides = (equation.reactants.items(), equation.products.items())
+    else:
+        sides = (((c, c.coefficient) for c in equation.reactants), ((c, c.coefficient) for c in equation.products))
+    return tuple(tuple((compound.comp_str, coefficient) for compound, coefficient in side) for side in sides)
+
+
+def _normalize(coefficient: float) -> int | float:
+    return int(coefficient) if float(coefficient).is_integer() else coefficient
+
+
+class ReactionLibrary:
+    """
+    Reactions indexed by the species they consume and produce and by the elements they involve.
+
+    Queries return `Equation`s (with `h_rxn` set), built on first access from the
+    stored species and coefficients, so loading a saved library parses no formulas.
+    """
+    def __init__(self) -> None:
+        self._records: list[ReactionRecord] = []
+        self._equations: list[Optional[Equation]] = []
+        self._by_species: dict[str, dict[int, int | float]] = {}
+        self._by_element: dict[str, set[int]] = {}
+        self._element_counts: list[int] = []
+        self._species_elements: dict[str, tuple[str, ...]] = {}
+
+    def _index(self, record: ReactionRecord) -> int:
+        reaction = len(self._records)
+        self._records.append(record)
+        self._equations.append(None)
+        elements: set[str] = set()
+        for formula, coefficient in record.species.items():
+            self._by_species.setdefault(formula, {})[reaction] = coefficient
+            elements.update(self._species_elements[formula])
+        for element in elements:
+            self._by_element.setdefault(element, set()).add(reaction)
+        self._element_counts.append(len(elements))
+        return reaction
+
+    def add(self, equation: Equation | Equation2, h_rxn: Optional[float] = None) -> int:
+        """Adds `equation` (with `h_rxn`, defaulting to `equation.h_rxn`) and returns its reaction id."""
+        if not isinstance(equation, (Equation, Equation2)):
+            raise TypeError('Expected `Equation` or `Equation2` for `equation` argument but received '
+                            f'`{equation.__class__.__name__}` instead.')
+        species: dict[str, int | float] = {}
+        for compound, coefficient in equation.stoichiometry().items():
+            formula = compound.composition.formula
+            if formula not in self._species_elements:
+                self._species_elements[formula] = tuple(element.symbol for element in compound.composition)
+            species[formula] = coefficient
+        h_rxn = equation.h_rxn if h_rxn is None else h_rxn
+        reactants, products = _equation_sides(equation)
+        return self._index(ReactionRecord(reactants, products, h_rxn, species))
+
+    def extend(self, equations: Iterable[Equation | Equation2 | tuple[Equation | Equation2, Optional[float]]]) -> list[int]:
+        """Adds every equation, or `(equation, h_rxn)` pair, and returns their reaction ids."""
+        return [self.add(*item) if isinstance(item, tuple) else self.add(item) for item in equations]
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, reaction: int) -> Equation:
+        equation = self._equations[reaction]
+        if equation is None:
+            record = self._records[reaction]
+            equation = Equation(*([self._compound(comp_str, coefficient) for comp_str, coefficient in side]
+                                  for side in (record.reactants, record.products)))
+            equation.h_rxn = record.h_rxn
+            self._equations[reaction] = equation
+        return equation
+
+    @staticmethod
+    def _compound(comp_str: str, coefficient: int | float) -> Compound:
+        compound = Compound(comp_str)
+        compound.coefficient = coefficient
+        return compound
+
+    def __iter__(self) -> Iterator[Equation]:
+        return (self[reaction] for reaction in range(len(self)))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(reactions={len(self)}, species={len(self._by_species)})'
+
+    def record(self, reaction: int) -> ReactionRecord:
+        return self._records[reaction]
+
+    @property
+    def species(self) -> list[str]:
+        """The canonical formula of every species in the library."""
+        return list(self._by_species)
+
+    def species_index(self) -> dict[str, set[int]]:
+        """Returns the ids of the reactions involving each species, keyed by canonical formula."""
+        return {formula: set(postings) for formula, postings in self._by_species.items()}
+
+    def _species_ids(self, species: str | Compound, sign: int = 0) -> set[int]:
+        postings = self._by_species.get(species_key(species), {})
+        if not sign:
+            return set(postings)
+        return {reaction for reaction, coefficient in postings.items() if coefficient * sign > 0}
+
+    def _only_elements_ids(self, elements: Iterable[str]) -> set[int]:
+        hits: Counter[int] = Counter()
+        for element in set(elements):
+            hits.update(self._by_element.get(str(element), ()))
+        return {reaction for reaction, count in hits.items() if count == self._element_counts[reaction]}
+
+    def query_ids(self,
+                  producing: Optional[str | Compound] = None,
+                  consuming: Optional[str | Compound] = None,
+                  involving: Optional[str | Compound] = None,
+                  element: Optional[str] = None,
+                  only_elements: Optional[Iterable[str]] = None) -> list[int]:
+        """Returns the ids, in insertion order, of the reactions matching every given condition."""
+        matches: Optional[set[int]] = None
+        conditions = [
+            (producing, lambda: self._species_ids(producing, 1)),
+            (consuming, lambda: self._species_ids(consuming, -1)),
+            (involving, lambda: self._species_ids(involving)),
+            (element, lambda: set(self._by_element.get(str(element), ()))),
+            (only_elements, lambda: self._only_elements_ids(only_elements)),
+        ]
+        for value, lookup in conditions:
+            if value is None:
+                continue
+            found = lookup()
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        return sorted(range(len(self)) if matches is None else matches)
+
+    def query(self, **conditions) -> list[Equation]:
+        """Returns the reactions matching every condition (see `query_ids`)."""
+        return [self[reaction] for reaction in self.query_ids(**conditions)]
+
+    def producing(self, species: str | Compound) -> list[Equation]:
+        return self.query(producing=species)
+
+    def consuming(self, species: str | Compound) -> list[Equation]:
+        return self.query(consuming=species)
+
+    def involving(self, species: str | Compound) -> list[Equation]:
+        return self.query(involving=species)
+
+    def with_only_elements(self, elements: Iterable[str]) -> list[Equation]:
+        """Returns the reactions whose species contain no elements other than `elements`, e.g. `['C', 'H', 'O']`."""
+        return self.query(only_elements=elements)
+
+    def save(self, path: str) -> None:
+        """Writes the library to the SQLite database at `path`, replacing its contents."""
+        connection = connect(path, LIBRARY_SCHEMA)
+        try:
+            with transaction(connection):
+                recreate(connection, LIBRARY_SCHEMA)
+                species_ids = {formula: i for i, formula in enumerate(self._by_species)}
+                connection.executemany('INSERT INTO species VALUES (?, ?, ?)', (
+                    (i, formula, ' '.join(self._species_elements[formula])) for formula, i in species_ids.items()))
+                connection.executemany('INSERT INTO reactions VALUES (?, ?, ?)', (
+                    (i, json.dumps([record.reactants, record.products]), record.h_rxn)
+                    for i, record in enumerate(self._records)))
+                connection.executemany('INSERT INTO reaction_species VALUES (?, ?, ?)', (
+                    (i, species_ids[formula], coefficient)
+                    for i, record in enumerate(self._records)
+                    for formula, coefficient in record.species.items()))
+        finally:
+            connection.close()
+
+    @classmethod
+    def load(cls, path: str) -> Self:
+        """Reads a library written by `save`, rebuilding its indexes without parsing any formulas."""
+        library = cls()
+        connection = connect(path, LIBRARY_SCHEMA, read_only=True)
+        try:
+            formulas: dict[int, str] = {}
+            for i, formula, elements in connection.execute('SELECT id, formula, elements FROM species'):
+                formulas[i] = formula
+                library._species_elements[formula] = tuple(elements.split())
+            species: dict[int, dict[str, int | float]] = {}
+            for reaction, i, coefficient in connection.execute(
+                    'SELECT reaction, species, coefficient FROM reaction_species ORDER BY reaction'):
+                species.setdefault(reaction, {})[formulas[i]] = _normalize(coefficient)
+            for reaction, sides, h_rxn in connection.execute('SELECT id, sides, h_rxn FROM reactions ORDER BY id'):
+                reactants, products = (tuple((comp_str, coefficient) for comp_str, coefficient in side)
+                                       for side in json.loads(sides))
+                library._index(ReactionRecord(reactants, products, h_rxn, species.get(reaction, {})))
+        finally:
+            connection.close()
+        return library
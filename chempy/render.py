@@ -0,0 +1,126 @@
+"""
+Cached text, LaTeX, HTML and Unicode renderings of formulas and equations.
+
+A formula string is scanned once into a `FormulaTemplate` holding all four
+renderings, shared through `RENDER_CACHE`. Equations are assembled by joining
+the cached pieces with their coefficients, so rendering is linear in the size
+of the equation whatever the formulas look like.
+
+    >>> formula_template('CuSO4·5H2O').latex
+    '\\\\text{C}\\\\text{u}\\\\text{S}\\\\text{O}_{4}\\\\cdot\\\\text{5}\\\\text{H}_{2}\\\\text{O}'
+    >>> formula_template('SO4^2-').unicode
+    'SO₄²⁻'
+    >>> formula_template('[Cu(H2O)4]^2+').html
+    '[Cu(H<sub>2</sub>O)<sub>4</sub>]<sup>2+</sup>'
+"""
+from .data import HYDRATE_DELIMS, CHARGE_DELIM, LEFT_DELIMS, RIGHT_DELIMS
+from .utils import LRUCache
+from .utils.tokenize import read_charge, read_digits
+from collections.abc import Iterable
+from html import escape
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from .compound import Compound
+
+
+STYLES = ('text', 'latex', 'html', 'unicode')
+
+SUBSCRIPT_DIGITS = str.maketrans('0123456789', '₀₁₂₃₄₅₆₇₈₉')
+SUPERSCRIPT_DIGITS = str.maketrans('0123456789+-', '⁰¹²³⁴⁵⁶⁷⁸⁹⁺⁻')
+
+
+class FormulaTemplate(NamedTuple):
+    """Every rendering of one formula string."""
+    text: str
+    latex: str
+    html: str
+    unicode: str
+
+
+def _latex_char(char: str) -> str:
+    return f'\\text{{{'\\' + char if char in '{}' else char}}}'
+
+
+def _compile(comp_str: str) -> FormulaTemplate:
+    """
+    Renders `comp_str` in a single pass.
+
+    Digits after an element symbol or a closing delimiter are subscripts, digits after
+    a hydrate dot are a plain coefficient and a charge (`^2-`, `^{3+}`) is a superscript.
+    """
+    latex: list[str] = []
+    html: list[str] = []
+    unicode: list[str] = []
+    length = len(comp_str)
+    previous = None
+    i = 0
+    while i < length:
+        char = comp_str[i]
+        if '0' <= char <= '9':
+            _, end = read_digits(comp_str, i)
+            digits = comp_str[i:end]
+            if previous in ('symbol', 'right'):
+                latex.append(f'_{{{digits}}}')
+                html.append(f'<sub>{digits}</sub>')
+                unicode.append(digits.translate(SUBSCRIPT_DIGITS))
+            else:
+                latex.append(_latex_char(digits))
+                html.append(digits)
+                unicode.append(digits)
+            previous = 'digits'
+            i = end
+            continue
+        if char in HYDRATE_DELIMS and previous is not None:
+            latex.append('\\cdot')
+            html.append('·')
+            unicode.append('·')
+            previous = 'hydrate'
+            i += 1
+            continue
+        if char == CHARGE_DELIM:
+            charge, end = read_charge(comp_str, i)
+            if charge is not None:
+                sign = '+' if charge > 0 else '-'
+                label = f'{abs(charge) if abs(charge) != 1 else ''}{sign}'
+                latex.append(f'^{{{label}}}')
+                html.append(f'<sup>{label}</sup>')
+                unicode.append(label.translate(SUPERSCRIPT_DIGITS))
+                previous = 'charge'
+                i = end
+                continue
+        if char != ' ':
+            latex.append(_latex_char(char))
+            html.append(escape(char))
+            unicode.append(char)
+            previous = 'left' if char in LEFT_DELIMS else 'right' if char in RIGHT_DELIMS else 'symbol'
+        i += 1
+    return FormulaTemplate(comp_str.strip(), ''.join(latex), ''.join(html), ''.join(unicode))
+
+
+RENDER_CACHE = LRUCache(maxsize=4096)
+
+
+def formula_template(comp_str: str) -> FormulaTemplate:
+    """Returns the renderings of `comp_str`, served from `RENDER_CACHE` when possible."""
+    return RENDER_CACHE.get_or_create(comp_str, _compile)
+
+
+def render_term(compound: 'Compound', coefficient: Optional[str], style: str = 'text') -> str:
+    """Renders `compound` in `style`, prefixed by `coefficient` (already formatted, or `None` for 1)."""
+    formula = compound.latexify() if style == 'latex' else getattr(formula_template(compound.comp_str), style)
+    if coefficient is None:
+        return formula
+    if style == 'latex':
+        return f'\\text{{{coefficient}}}({formula})'
+    return f'{coefficient}({formula})'
+
+
+def render_equation(reactants: Iterable[tuple['Compound', Optional[str]]],
+                    products: Iterable[tuple['Compound', Optional[str]]],
+                    style: str = 'text') -> str:
+    """Renders an equation from `(compound, formatted coefficient)` pairs of each side."""
+    if style not in STYLES:
+        raise ValueError(f'Expected one of {STYLES} for `style` argument but received `{style!r}` instead.')
+    return ' → '.join(' + '.join(render_term(compound, coefficient, style) for compound, coefficient in side)
+                      for side in (reactants, products))
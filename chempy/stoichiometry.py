@@ -0,0 +1,129 @@
+"""
+Limiting reagents, theoretical yields and excess amounts of balanced equations.
+
+The coefficients and molar masses of an equation's species are read once into
+NumPy vectors; amounts of reactants may then carry any number of leading batch
+axes, so thousands of scenarios are solved in one vectorized pass without
+creating a `Compound` per scenario.
+
+    >>> from chempy import Equation
+    >>> equation = Equation.parse_from_string('H2 + O2 -> H2O')
+    >>> equation.balance()
+    >>> result = limiting_reagent(equation, masses=[[4.0, 16.0], [4.0, 64.0]])
+    >>> result.limiting
+    array([1, 0])
+    >>> result.product_masses.round(3)
+    array([[18.016],
+           [35.746]])
+"""
+from .compound import Compound
+from .equation import Equation
+from .equation2 import Equation2
+from .reaction_library import species_key
+from collections.abc import Mapping, Sequence
+from typing import NamedTuple, Optional
+import numpy as np
+
+
+type Amounts = Mapping[str | Compound, float | Sequence[float] | np.ndarray] | Sequence | np.ndarray
+
+
+class StoichiometryResult(NamedTuple):
+    """
+    Amounts of every scenario; the last axis runs over `reactants` or `products`.
+
+    `limiting` is the index into `reactants` of the limiting reagent and `extent`
+    the moles of reaction it allows.
+    """
+    reactants: list[Compound]
+    products: list[Compound]
+    limiting: np.ndarray
+    extent: np.ndarray
+    reactant_moles: np.ndarray
+    excess_moles: np.ndarray
+    excess_masses: np.ndarray
+    product_moles: np.ndarray
+    product_masses: np.ndarray
+
+    @property
+    def limiting_reagents(self) -> list[Compound]:
+        """The limiting reagent of every scenario, for a flat batch."""
+        return [self.reactants[i] for i in np.ravel(self.limiting)]
+
+
+def _sides(equation: Equation | Equation2) -> tuple[list[Compound], np.ndarray, list[Compound], np.ndarray]:
+    if isinstance(equation, Equation2):
+        if not equation.reactants.is_equal(equation.products):
+            raise ValueError('Expected a balanced equation.')
+        sides = (equation.reactants.items(), equation.products.items())
+    elif isinstance(equation, Equation):
+        if not equation.get_is_balanced():
+            raise ValueError('Expected a balanced equation.')
+        sides = ([(c, c.coefficient) for c in equation.reactants], [(c, c.coefficient) for c in equation.products])
+    else:
+        raise TypeError('Expected `Equation` or `Equation2` for `equation` argument but received '
+                        f'`{equation.__class__.__name__}` instead.')
+    (reactants, reactant_coefficients), (products, product_coefficients) = (
+        (list(compounds), np.asarray(coefficients, dtype=np.float64))
+        for compounds, coefficients in (zip(*side) for side in sides))
+    return reactants, reactant_coefficients, products, product_coefficients
+
+
+def _amounts(amounts: Amounts, reactants: list[Compound]) -> np.ndarray:
+    """Returns `amounts` as an array whose last axis runs over `reactants`."""
+    if isinstance(amounts, Mapping):
+        by_formula = {species_key(species): amount for species, amount in amounts.items()}
+        keys = [reactant.composition.formula for reactant in reactants]
+        missing = [key for key in keys if key not in by_formula]
+        if missing:
+            raise ValueError(f'No amount given for reactant(s) `{'`, `'.join(missing)}`.')
+        columns = np.broadcast_arrays(*(np.asarray(by_formula[key], dtype=np.float64) for key in keys))
+        return np.stack(columns, axis=-1)
+    array = np.asarray(amounts, dtype=np.float64)
+    if array.ndim == 0 or array.shape[-1] != len(reactants):
+        raise ValueError(f'Expected the last axis of the amounts to have length {len(reactants)} '
+                         f'(one per reactant) but received shape `{array.shape}` instead.')
+    return array
+
+
+def limiting_reagent(equation: Equation | Equation2,
+                     masses: Optional[Amounts] = None,
+                     moles: Optional[Amounts] = None) -> StoichiometryResult:
+    """
+    Returns the limiting reagent, theoretical yields and excess amounts of the balanced `equation`.
+
+    Give the reactant amounts as `masses` (grams) or `moles`, either as a mapping of
+    formulas to scalars or arrays, or as an array whose last axis runs over the
+    reactants in equation order. With neither, the `mass` of each reactant
+    `Compound` is used.
+    """
+    reactants, reactant_coefficients, products, product_coefficients = _sides(equation)
+    reactant_molar_masses = np.array([reactant.molar_mass for reactant in reactants])
+    if masses is not None and moles is not None:
+        raise ValueError('Expected only one of `masses` and `moles`.')
+    if moles is not None:
+        amounts = _amounts(moles, reactants)
+    else:
+        if masses is None:
+            if any(reactant.mass is None for reactant in reactants):
+                raise ValueError('Expected `masses` or `moles`, or a `mass` on every reactant.')
+            masses = [reactant.mass for reactant in reactants]
+        amounts = _amounts(masses, reactants) / reactant_molar_masses
+    if np.any(amounts < 0):
+        raise ValueError('Expected non-negative reactant amounts.')
+    ratios = amounts / reactant_coefficients
+    limiting = np.argmin(ratios, axis=-1)
+    extent = np.take_along_axis(ratios, limiting[..., None], axis=-1)
+    excess = np.maximum(amounts - extent * reactant_coefficients, 0.0)
+    product_moles = extent * product_coefficients
+    return StoichiometryResult(
+        reactants=reactants,
+        products=products,
+        limiting=limiting,
+        extent=extent[..., 0],
+        reactant_moles=amounts,
+        excess_moles=excess,
+        excess_masses=excess * reactant_molar_masses,
+        product_moles=product_moles,
+        product_masses=product_moles * np.array([product.molar_mass for product in products]),
+    )
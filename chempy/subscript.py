@@ -4,7 +4,8 @@ class Subscript:
     def __init__(self, comp_str: str, 
                  element_index: Optional[int] = None, 
                  start_index: Optional[int] = None, 
-                 size: Optional[int] = None) -> None:
+                 size: Optional[int] = None,
+                 subs: Optional[int] = None) -> None:
         if not isinstance(comp_str, str):
             raise TypeError('Expected `str` for `comp_str` argument but received '
                             f'`{comp_str.__class__.__name__}` instead.')
@@ -14,7 +15,10 @@ class Subscript:
         self.element_index = element_index
         self.start_index = start_index
         self.element_str = self.comp_str[element_index:start_index]
-        self.size, self.subs = self._get_sizes()
+        if size is None:
+            self.size, self.subs = self._get_sizes()
+        else:
+            self.size, self.subs = size, subs
 
     def _get_sizes(self) -> tuple[int, Optional[int]]:
         size = ''
@@ -0,0 +1,177 @@
+"""
+Reaction enthalpies, entropies and Gibbs energies from tabulated formation data.
+
+Species are looked up by canonical formula (see `Composition.formula`) and phase
+in a `ThermoTable`, which holds the bundled standard data (`thermo_data.csv`) as
+one NumPy array. A reaction is evaluated as a single product of its coefficient
+vector with the rows of its species, and batches of reactions as one sparse
+product, so thousands of reactions cost little more than one.
+
+    >>> from chempy import Equation
+    >>> from chempy.thermo import reaction_thermo
+    >>> equation = Equation.parse_from_string('CH4 + O2 -> CO2 + H2O')
+    >>> equation.balance()
+    >>> [round(value, 2) for value in reaction_thermo(equation)]
+    [-890.36, -242.98, -817.9]
+"""
+from .compound import Compound
+from .data import ThermoRow, thermo_rows
+from .equation import Equation
+from .equation2 import Equation2
+from .reaction_library import species_key
+from collections.abc import Iterable, Mapping
+from functools import cache
+from typing import NamedTuple, Optional
+import numpy as np
+
+
+STANDARD_TEMPERATURE = 298.15
+
+
+class ReactionThermo(NamedTuple):
+    """The change in enthalpy (kJ/mol), entropy (J/(mol K)) and Gibbs energy (kJ/mol) of a reaction."""
+    enthalpy: float
+    entropy: float
+    gibbs_energy: float
+
+
+class ThermoTable:
+    """
+    Formation enthalpies, entropies and Gibbs energies indexed by species and phase.
+
+    `properties` is an `(n, 3)` float array of those three columns. When a species is
+    looked up without a phase, its first row (its standard state) is used.
+    """
+    def __init__(self, rows: Iterable[ThermoRow] = ()) -> None:
+        self._index: dict[tuple[str, str], int] = {}
+        self._standard: dict[str, int] = {}
+        self._rows: list[ThermoRow] = []
+        self.properties = np.empty((0, 3))
+        self.extend(rows)
+
+    def extend(self, rows: Iterable[ThermoRow]) -> None:
+        """Adds `rows`, replacing any existing row for the same species and phase."""
+        added: list[list[float]] = []
+        for row in rows:
+            key = species_key(row.formula)
+            values = [row.enthalpy_of_formation, row.entropy, row.gibbs_energy_of_formation]
+            existing = self._index.get((key, row.phase))
+            if existing is not None:
+                self._rows[existing] = row
+                if existing < len(self.properties):
+                    self.properties[existing] = values
+                else:
+                    added[existing - len(self.properties)] = values
+                continue
+            position = len(self._rows)
+            self._index[(key, row.phase)] = position
+            self._standard.setdefault(key, position)
+            self._rows.append(row)
+            added.append(values)
+        if added:
+            self.properties = np.vstack([self.properties, np.array(added, dtype=np.float64)])
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(rows={len(self)})'
+
+    def __contains__(self, species: str | Compound) -> bool:
+        return species_key(species) in self._standard
+
+    def position(self, species: str | Compound, phase: Optional[str] = None) -> int:
+        """Returns the row of `species` in `phase` (its standard state by default)."""
+        key = species_key(species)
+        position = self._standard.get(key) if phase is None else self._index.get((key, phase))
+        if position is None:
+            phase_str = '' if phase is None else f' ({phase})'
+            raise ValueError(f'No thermochemical data for `{key}`{phase_str}.')
+        return position
+
+    def row(self, species: str | Compound, phase: Optional[str] = None) -> ThermoRow:
+        return self._rows[self.position(species, phase)]
+
+    def _positions(self, equation: Equation | Equation2, phases: Mapping[str, str]
+                   ) -> tuple[list[int], list[float]]:
+        positions: list[int] = []
+        coefficients: list[float] = []
+        for compound, coefficient in equation.stoichiometry().items():
+            key = compound.composition.formula
+            positions.append(self.position(key, phases.get(key)))
+            coefficients.append(coefficient)
+        return positions, coefficients
+
+    def _finish(self, totals: np.ndarray, temperature: float) -> np.ndarray:
+        if temperature != STANDARD_TEMPERATURE:
+            totals[..., 2] = totals[..., 0] - temperature * totals[..., 1] / 1000
+        return totals
+
+    def reaction(self, equation: Equation | Equation2,
+                 phases: Optional[Mapping[str, str]] = None,
+                 temperature: float = STANDARD_TEMPERATURE) -> ReactionThermo:
+        """
+        Returns ΔH, ΔS and ΔG of the balanced `equation`.
+
+        `phases` maps formulas to the phase to use (e.g. `{'H2O': 'g'}`). At
+        temperatures other than 298.15 K, ΔG is estimated as ΔH - TΔS.
+        """
+        phases = _normalize_phases(phases)
+        positions, coefficients = self._positions(equation, phases)
+        totals = np.asarray(coefficients, dtype=np.float64) @ self.properties[positions]
+        return ReactionThermo(*(float(value) for value in self._finish(totals, temperature)))
+
+    def reactions(self, equations: Iterable[Equation | Equation2],
+                  phases: Optional[Mapping[str, str]] = None,
+                  temperature: float = STANDARD_TEMPERATURE) -> np.ndarray:
+        """
+        Returns an `(n, 3)` array of ΔH, ΔS and ΔG for every balanced equation.
+
+        Rows of equations with a species missing from the table are NaN.
+        """
+        phases = _normalize_phases(phases)
+        rows: list[int] = []
+        positions: list[int] = []
+        coefficients: list[float] = []
+        missing: list[int] = []
+        count = 0
+        for i, equation in enumerate(equations):
+            count += 1
+            try:
+                found, found_coefficients = self._positions(equation, phases)
+            except ValueError:
+                missing.append(i)
+                continue
+            rows.extend([i] * len(found))
+            positions.extend(found)
+            coefficients.extend(found_coefficients)
+        totals = np.zeros((count, 3))
+        if rows:
+            np.add.at(totals, np.asarray(rows),
+                      np.asarray(coefficients, dtype=np.float64)[:, None] * self.properties[positions])
+        totals[missing] = np.nan
+        return self._finish(totals, temperature)
+
+
+def _normalize_phases(phases: Optional[Mapping[str, str]]) -> dict[str, str]:
+    return {species_key(species): phase for species, phase in (phases or {}).items()}
+
+
+@cache
+def thermo_table() -> ThermoTable:
+    """Returns the `ThermoTable` of the bundled standard data."""
+    return ThermoTable(thermo_rows())
+
+
+def reaction_thermo(equation: Equation | Equation2,
+                    phases: Optional[Mapping[str, str]] = None,
+                    temperature: float = STANDARD_TEMPERATURE) -> ReactionThermo:
+    """Returns ΔH, ΔS and ΔG of `equation` from the bundled data (see `ThermoTable.reaction`)."""
+    return thermo_table().reaction(equation, phases, temperature)
+
+
+def reactions_thermo(equations: Iterable[Equation | Equation2],
+                     phases: Optional[Mapping[str, str]] = None,
+                     temperature: float = STANDARD_TEMPERATURE) -> np.ndarray:
+    """Returns ΔH, ΔS and ΔG of every equation from the bundled data (see `ThermoTable.reactions`)."""
+    return thermo_table().reactions(equations, phases, temperature)
@@ -1,9 +1,30 @@
-from .tokenize import tokenize
-from .split_str import split_str
+from .tokenize import tokenize, parse_formula, FormulaTokens, TokenView
+from .split_str import split_str, split_terms
+from .lru_cache import LRUCache, CacheInfo
+from .nullspace import (
+    balance_coefficients,
+    integer_nullspace,
+    integer_rref,
+    BalanceError,
+    ImpossibleEquationError,
+    UnderdeterminedEquationError
+)
 from .modify_coefs import strip_coefficients, extract_coefficient
 __all__ = [
     'tokenize',
+    'parse_formula',
+    'FormulaTokens',
+    'TokenView',
     'split_str',
+    'split_terms',
+    'LRUCache',
+    'CacheInfo',
+    'balance_coefficients',
+    'integer_nullspace',
+    'integer_rref',
+    'BalanceError',
+    'ImpossibleEquationError',
+    'UnderdeterminedEquationError',
     'strip_coefficients',
     'extract_coefficient'
 ]
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+The SQLite schemas of chempy's on-disk stores and the helpers that open them.
+
+`sqlite3` is imported only when a database is opened, so importing chempy does
+not load it.
+"""
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+import os
+import re
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+BALANCED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS balanced (
+    digest BLOB PRIMARY KEY,
+    reaction TEXT NOT NULL,
+    coefficients TEXT NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS balanced_last_used ON balanced (last_used);
+"""
+
+LIBRARY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reactions (
+    id INTEGER PRIMARY KEY,
+    sides TEXT NOT NULL,
+    h_rxn REAL
+);
+CREATE TABLE IF NOT EXISTS species (
+    id INTEGER PRIMARY KEY,
+    formula TEXT NOT NULL UNIQUE,
+    elements TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reaction_species (
+    reaction INTEGER NOT NULL REFERENCES reactions(id),
+    species INTEGER NOT NULL REFERENCES species(id),
+    coefficient REAL NOT NULL,
+    PRIMARY KEY (reaction, species)
+) WITHOUT ROWID;
+"""
+
+
+def tables(schema: str) -> list[str]:
+    """Returns the names of the tables `schema` creates, in order."""
+    return re.findall(r'CREATE TABLE IF NOT EXISTS (\w+)', schema)
+
+
+def connect(path: str | os.PathLike, schema: str, read_only: bool = False, shared: bool = False) -> 'sqlite3.Connection':
+    """
+    Opens the database at `path` in autocommit mode, creating the tables of `schema` unless `read_only`.
+
+    A `shared` database, written by several processes at once, uses the WAL journal
+    so that readers are not blocked while one process writes.
+    """
+    import sqlite3
+    path = os.fspath(path)
+    if read_only:
+        return sqlite3.connect(f'file:{path}?mode=ro', uri=True, isolation_level=None, check_same_thread=False)
+    connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+    if shared:
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+    connection.executescript(schema)
+    return connection
+
+
+@contextmanager
+def transaction(connection: 'sqlite3.Connection') -> Iterator['sqlite3.Connection']:
+    """Runs the statements of the block in one transaction, rolled back if the block raises."""
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        yield connection
+    except BaseException:
+        connection.execute('ROLLBACK')
+        raise
+    connection.execute('COMMIT')
+
+
+def recreate(connection: 'sqlite3.Connection', schema: str) -> None:
+    """Drops the tables of `schema` and creates them again, empty. Call it inside a `transaction`."""
+    for table in reversed(tables(schema)):
+        connection.execute(f'DROP TABLE IF EXISTS {table}')
+    for statement in schema.split(';'):
+        if statement.strip():
+            connection.execute(statement)
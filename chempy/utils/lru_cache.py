@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from threading import Lock
+from typing import Any, NamedTuple, Optional
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """
+    A bounded, thread-safe least-recently-used cache.
+
+    `maxsize=0` disables storage entirely (every lookup is a miss).
+    """
+    def __init__(self, maxsize: int = 4096) -> None:
+        if not isinstance(maxsize, int) or maxsize < 0:
+            raise ValueError(f'Expected a non-negative `int` for `maxsize` argument but received `{maxsize!r}` instead.')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Returns the value stored under `key`, marking it as most recently used."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Stores `value` under `key`, evicting the least recently used entries beyond `maxsize`."""
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[Hashable], Any]) -> Any:
+        """
+        Returns the value stored under `key`, calling `factory(key)` to create it on a miss.
+
+        `factory` runs outside the lock, so concurrent misses on the same key may each
+        call it; the first stored result wins and is returned to every caller.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = factory(key)
+        with self._lock:
+            if key in self._data:
+                return self._data[key]
+            self._store(key, value)
+        return value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        """Changes the capacity of the cache, evicting the least recently used entries if it shrinks."""
+        if not isinstance(maxsize, int) or maxsize < 0:
+            raise ValueError(f'Expected a non-negative `int` for `maxsize` argument but received `{maxsize!r}` instead.')
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        """Returns the hit/miss statistics and the current size of the cache."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def clear(self) -> None:
+        """Empties the cache and resets its statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(maxsize={self.maxsize})'
@@ -1,4 +1,5 @@
 from ..data import ALL_DELIMS
+from fractions import Fraction
 
 def strip_coefficients(comp_str: str) -> str:
     comp_str = comp_str.strip()
@@ -23,6 +24,18 @@ def strip_coefficients(comp_str: str) -> str:
 
 
 def extract_coefficient(comp_str: str) -> tuple[float, bool]:
+    """
+    Returns the leading coefficient of `comp_str` (an integer, decimal or fraction) and whether it was left out.
+
+    Raises `ValueError` for any other prefix, so untrusted text is never evaluated.
+
+        >>> extract_coefficient('1/2O2'), extract_coefficient('H2O')
+        ((0.5, False), (1, True))
+        >>> extract_coefficient('2**3H2')
+        Traceback (most recent call last):
+        ...
+        ValueError: Expected a number as the coefficient of `2**3H2` but received `2**3` instead.
+    """
     subs = ''
     no_subscript = False
     for n in range(len(comp_str)+1):
@@ -31,7 +44,18 @@ def extract_coefficient(comp_str: str) -> tuple[float, bool]:
             break
         subs += digit
     if subs == '':
-        subs = '1'
-        no_subscript = True
-    return eval(subs), no_subscript
+        return 1, True
+    try:
+        return int(subs), no_subscript
+    except ValueError:
+        pass
+    try:
+        return float(subs), no_subscript
+    except ValueError:
+        pass
+    try:
+        # Fractions such as `1/2` are the only other form accepted; nothing is evaluated.
+        return float(Fraction(subs)), no_subscript
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f'Expected a number as the coefficient of `{comp_str}` but received `{subs.strip()}` instead.') from None
     
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""
+Exact integer balancing of chemical equations.
+
+Each row of the matrix is one element and each column one compound, with product
+counts negated; the balance is the positive primitive vector spanning the matrix's
+integer nullspace.
+
+    >>> balance_coefficients([[3, 0, -1, 0], [8, 0, 0, -2], [0, 2, -2, -1]])  # C3H8 + O2 -> CO2 + H2O
+    [1, 5, 3, 4]
+    >>> balance_coefficients([[1, 0, -1, 0, 0, 0], [1, 0, 0, -1, 0, 0], [4, 0, 0, 0, -1, 0],
+    ...                       [0, 1, 0, 0, -2, 0], [0, 1, -1, -2, 0, -2]])  # KMnO4 + HCl -> KCl + MnCl2 + H2O + Cl2
+    [2, 16, 2, 2, 8, 5]
+
+`H2 + O2 -> H2O + H2O2` combines two independent reactions, so only a
+non-strict balance returns (one particular) answer:
+
+    >>> underdetermined = [[2, 0, -2, -2], [0, 2, -1, -2]]
+    >>> balance_coefficients(underdetermined)
+    [4, 3, 2, 2]
+    >>> balance_coefficients(underdetermined, strict=True)
+    Traceback (most recent call last):
+    ...
+    chempy.utils.nullspace.UnderdeterminedEquationError: Underdetermined equation: 2 independent reactions balance it.
+    >>> balance_coefficients([[1, -1], [0, 1]])
+    Traceback (most recent call last):
+    ...
+    chempy.utils.nullspace.ImpossibleEquationError: Impossible equation: only the trivial solution balances it.
+"""
+from fractions import Fraction
+from math import gcd, lcm
+from typing import Optional
+
+
+class BalanceError(ValueError):
+    """Raised when a chemical equation has no unique positive balance."""
+
+
+class ImpossibleEquationError(BalanceError):
+    """Raised when no set of positive coefficients balances the equation."""
+
+
+class UnderdeterminedEquationError(BalanceError):
+    """Raised when the equation combines several independent reactions, so its balance is not unique."""
+    def __init__(self, message: str, basis: list[list[int]]) -> None:
+        super().__init__(message)
+        self.basis = basis
+
+
+def _primitive(row: list[int]) -> list[int]:
+    divisor = gcd(*row)
+    return row if divisor in (0, 1) else [value // divisor for value in row]
+
+
+def integer_rref(matrix: list[list[int]]) -> tuple[list[list[int]], list[int]]:
+    """
+    Returns the reduced row echelon form of an integer matrix and its pivot columns.
+
+    Uses fraction-free elimination: rows stay integral and are divided by their gcd
+    after every step, so entries never grow beyond what the answer needs and no
+    rational arithmetic is involved. Zero rows are dropped.
+    """
+    rows = [_primitive([int(value) for value in row]) for row in matrix if any(row)]
+    columns = len(matrix[0]) if matrix else 0
+    pivots: list[int] = []
+    rank = 0
+    for column in range(columns):
+        candidates = [r for r in range(rank, len(rows)) if rows[r][column]]
+        if not candidates:
+            continue
+        best = min(candidates, key=lambda r: abs(rows[r][column]))
+        rows[rank], rows[best] = rows[best], rows[rank]
+        pivot_row = rows[rank]
+        pivot = pivot_row[column]
+        for r, row in enumerate(rows):
+            factor = row[column]
+            if r == rank or not factor:
+                continue
+            rows[r] = _primitive([pivot * a - factor * b for a, b in zip(row, pivot_row)])
+        pivots.append(column)
+        rank += 1
+        if rank == len(rows):
+            break
+    return rows[:rank], pivots
+
+
+def integer_nullspace(matrix: list[list[int]], columns: Optional[int] = None) -> list[list[int]]:
+    """
+    Returns a basis of the integer nullspace of `matrix`, one primitive vector per free column.
+
+    `columns` is only needed when `matrix` has no rows.
+    """
+    columns = len(matrix[0]) if matrix else (columns or 0)
+    rows, pivots = integer_rref(matrix)
+    pivot_set = set(pivots)
+    basis: list[list[int]] = []
+    for free in range(columns):
+        if free in pivot_set:
+            continue
+        scale = lcm(*(abs(row[column]) for row, column in zip(rows, pivots))) if rows else 1
+        vector = [0] * columns
+        vector[free] = scale
+        for row, column in zip(rows, pivots):
+            vector[column] = -row[free] * scale // row[column]
+        basis.append(_primitive(vector))
+    return basis
+
+
+def balance_coefficients(matrix: list[list[int]], columns: Optional[int] = None,
+                         strict: bool = False) -> list[int]:
+    """
+    Returns the smallest positive integer coefficients `x` with `matrix @ x == 0`.
+
+    Each row of `matrix` holds the count of one element in every compound, negated
+    for products. Raises `ImpossibleEquationError` if no positive solution exists.
+
+    When the nullspace has more than one dimension the equation is underdetermined.
+    With `strict=True` that raises `UnderdeterminedEquationError`; otherwise every
+    free coefficient is set to 1 and the result is returned if it is positive.
+    """
+    basis = integer_nullspace(matrix, columns)
+    if not basis:
+        raise ImpossibleEquationError('Impossible equation: only the trivial solution balances it.')
+    if len(basis) == 1:
+        solution = basis[0]
+    elif strict:
+        raise UnderdeterminedEquationError(
+            f'Underdetermined equation: {len(basis)} independent reactions balance it.', basis)
+    else:
+        rows, pivots = integer_rref(matrix)
+        free_columns = [column for column in range(len(basis[0])) if column not in pivots]
+        combined = [sum(Fraction(vector[i], vector[free]) for vector, free in zip(basis, free_columns))
+                    for i in range(len(basis[0]))]
+        scale = lcm(*(value.denominator for value in combined))
+        solution = _primitive([int(value * scale) for value in combined])
+    if all(value <= 0 for value in solution):
+        solution = [-value for value in solution]
+    if any(value <= 0 for value in solution):
+        raise ImpossibleEquationError('Impossible equation: no positive coefficients balance it.')
+    return solution
@@ -1,3 +1,5 @@
+from .tokenize import read_charge
+from ..data import CHARGE_DELIM
 from typing import Optional
 
 
@@ -7,4 +9,24 @@ def split_str(line: str) -> Optional[str]:
         if split_char not in line:
             continue
         return split_char
-    return None
\ No newline at end of file
+    return None
+
+
+def split_terms(side: str) -> list[str]:
+    """Splits one side of an equation on `+`, leaving the signs of charges such as `NH4^+` in their formulas."""
+    terms: list[str] = []
+    start = 0
+    i = 0
+    length = len(side)
+    while i < length:
+        char = side[i]
+        if char == CHARGE_DELIM:
+            _, end = read_charge(side, i)
+            i = max(end, i + 1)
+            continue
+        if char == '+':
+            terms.append(side[start:i])
+            start = i + 1
+        i += 1
+    terms.append(side[start:])
+    return terms
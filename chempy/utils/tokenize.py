@@ -1,122 +1,208 @@
-from ..data import *
+from ..data import RIGHT_DELIMS, MATCHING_DELIMS, HYDRATE_DELIMS, CHARGE_DELIM, periodic_table
 from ..element import Element
 from ..subscript import Subscript
-from typing import Optional, Self
+from bisect import bisect_right
 from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import accumulate, repeat
+from typing import NamedTuple, Optional, Self
 
 
-def nests_delims(comp_str: str, start: int, end: int) -> bool:
-    return any(char in ALL_DELIMS for char in comp_str[start+1:end-1])
-
-
-def get_element_count(comp_str: str, start: int) -> tuple[int, bool]:
-    subs = ''
-    no_subscript = False
-    for n in range(start, len(comp_str)+1):
-        digit = comp_str[n:n+1]
-        if not digit.isdigit():
-            break
-        subs += digit
-    if subs == '':
-        subs = 1
-        no_subscript = True
-    return int(subs), no_subscript
-
-
-def matching_delim_index(delim_list: list, delim: str) -> Optional[int]:
-    for i, ldm in enumerate(delim_list):
-        if ldm != delim:
-            continue
-        return i
-    return None
-
-
-def retrieve_delims(
-    comp_str: str, 
-    ldi: Optional[int] = None,
-    rdi: Optional[int] = None,
-) -> tuple[Optional[int], Optional[int]]:
-    right_count = 0
-    right_delim: Optional[str] = None
-    if ldi is None and rdi is not None:
-        return None, None
-    assert (isinstance(ldi, int) and isinstance(rdi, int))
-    ld, rd = None, None
-    for i in range(ldi, rdi):
-        c = comp_str[i]
-        if c in LEFT_DELIMS and ld is None and rd is None:
-            ld = i
-            matching_rdi = matching_delim_index(LEFT_DELIMS, c)
-            if matching_rdi is None:
-                raise TypeError(f'Right delim indices for {c} in {comp_str} could not be found.')
-            right_delim = RIGHT_DELIMS[matching_rdi]
-            continue
-        if c in LEFT_DELIMS:
-            right_count -= 1
-            continue
-        if c in RIGHT_DELIMS:
-            right_count += 1
-        if right_count > 0 and c == right_delim:
-            rd = i
-            break
-    return (ld, rd)
-
-
-def fetch_multiplier_list(
-        comp_str: str,
-        ldi: Optional[int],
-        rdi: Optional[int], 
-        subs = None,
-        p_list: Optional[list] = None,
-) -> list[tuple[int, int, int]]:
-    if subs is None:
-        subs = 1
-    if p_list is None:
-        p_list = []
-    ldi, rdi = retrieve_delims(comp_str, ldi, rdi)
-    if ldi is not None and rdi is None:
+class TokenView(Sequence):
+    """
+    A lazy, read-only sequence of the atoms in a formula.
+
+    Atoms are expanded on demand from `(Element, count)` runs in formula order, so
+    `[(C2H4)1000]50` holds four runs instead of 300,000 list entries.
+    """
+    __slots__ = ('_runs', '_ends')
+
+    def __init__(self, runs: Iterable[tuple[Element, int]]) -> None:
+        self._runs: tuple[tuple[Element, int], ...] = tuple(runs)
+        self._ends: list[int] = list(accumulate(count for _, count in self._runs))
+
+    def __len__(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def __iter__(self) -> Iterator[Element]:
+        for element, count in self._runs:
+            yield from repeat(element, count)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('TokenView index out of range')
+        return self._runs[bisect_right(self._ends, index)][0]
+
+    def __contains__(self, value) -> bool:
+        return any(element == value for element, _ in self._runs)
+
+    def count(self, value) -> int:
+        return sum(count for element, count in self._runs if element == value)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({list(self._runs)})'
+
+
+class FormulaTokens(NamedTuple):
+    """The result of `parse_formula`. `runs` and `positions` line up: one entry per element symbol in the formula."""
+    counts: Counter[Element]
+    runs: list[tuple[Element, int]]
+    positions: list[int]
+    subscripts: list[Subscript]
+    charge: int
+
+
+def read_digits(comp_str: str, start: int) -> tuple[Optional[int], int]:
+    """Returns the integer written at `start` (or `None` if there is none) and the index right after it."""
+    end = start
+    length = len(comp_str)
+    while end < length and '0' <= comp_str[end] <= '9':
+        end += 1
+    return (int(comp_str[start:end]) if end > start else None), end
+
+
+def read_charge(comp_str: str, start: int) -> tuple[Optional[int], int]:
+    """
+    Reads a charge such as `^2-`, `^+`, `^--` or `^{3+}` starting at `start`.
+
+    Returns the charge (or `None` if there is none at `start`) and the index right after it.
+    """
+    length = len(comp_str)
+    if comp_str[start] != CHARGE_DELIM:
+        return None, start
+    end = start + 1
+    braced = comp_str[end:end+1] == '{'
+    if braced:
+        end += 1
+    magnitude, end = read_digits(comp_str, end)
+    signs = end
+    while end < length and comp_str[end] in '+-' and comp_str[end] == comp_str[signs]:
+        end += 1
+    if end == signs:
+        return None, start
+    if magnitude is None:
+        magnitude, end = read_digits(comp_str, end)
+    if magnitude is None:
+        magnitude = end - signs
+    if braced:
+        if comp_str[end:end+1] != '}':
+            return None, start
+        end += 1
+    sign = 1 if comp_str[signs] == '+' else -1
+    return sign * magnitude, end
+
+
+def parse_formula(comp_str: str) -> FormulaTokens:
+    """
+    Parses `comp_str` into element counts, subscripts and positions in a single pass.
+
+    Supports nested `[]`, `()` and `{}` groups with multipliers, hydrates
+    (`CuSO4·5H2O`, `CuSO4.5H2O`, `CuSO4*5H2O`) and a charge at the end of the
+    formula (`SO4^2-`, `NH4^+`, `[Fe(CN)6]^{3-}`). A bare `+` or `-` is rejected
+    rather than guessed at, since `Fe3+` could mean Fe³⁺ or a charged Fe₃.
+    Group multipliers are resolved once at the end, so the work is linear in the
+    length of `comp_str` no matter how deeply it nests. Atoms are never expanded
+    individually (see `TokenView`).
+
+        >>> parsed = parse_formula('(SO4)^2-')
+        >>> dict(parsed.counts), parsed.charge
+        ({Element('S'): 1, Element('O'): 4}, -2)
+        >>> parse_formula('[Fe(CN)6]^{3-}').charge
+        -3
+        >>> parse_formula('Fe3+')
+        Traceback (most recent call last):
+        ...
+        ValueError: Unexpected `+` in `Fe3+`; write a charge as `^+` or `^2+` at the end of the formula.
+        >>> parse_formula('(SO4)2-')
+        Traceback (most recent call last):
+        ...
+        ValueError: Unexpected `-` in `(SO4)2-`; write a charge as `^-` or `^2-` at the end of the formula.
+        >>> parse_formula('Na+Cl-')
+        Traceback (most recent call last):
+        ...
+        ValueError: Unexpected `+` in `Na+Cl-`; write a charge as `^+` or `^2+` at the end of the formula.
+        >>> parse_formula('SO4^2-O')
+        Traceback (most recent call last):
+        ...
+        ValueError: Expected a charge such as `^2-` at the end of `SO4^2-O`.
+    """
+    raw_runs: list[tuple[Element, int, int]] = []
+    positions: list[int] = []
+    subs_list: list[Subscript] = []
+    parents: list[int] = [-1]
+    multipliers: list[int] = [1]
+    stack: list[tuple[str, int]] = []
+    group = 0
+    charge = 0
+    symbols = periodic_table().atomic_numbers
+    length = len(comp_str)
+    i = 0
+    while i < length:
+        char = comp_str[i]
+        if char in MATCHING_DELIMS:
+            subs, _ = read_digits(comp_str, i + 1)
+            subs_list.append(Subscript(comp_str, i, i + 1, 1 if subs is None else subs, subs))
+            stack.append((MATCHING_DELIMS[char], group))
+            parents.append(group)
+            multipliers.append(1)
+            group = len(parents) - 1
+            i += 1
+        elif char in RIGHT_DELIMS:
+            if not stack or stack[-1][0] != char:
+                raise Exception('Mismatched delims error. Compound={}'.format(comp_str))
+            subs, end = read_digits(comp_str, i + 1)
+            subs_list.append(Subscript(comp_str, i, i + 1, 1 if subs is None else subs, subs))
+            multipliers[group] = 1 if subs is None else subs
+            group = stack.pop()[1]
+            i = end
+        elif comp_str[i:i+2] in symbols or char in symbols:
+            start = i + 2 if comp_str[i:i+2] in symbols else i + 1
+            subs, end = read_digits(comp_str, start)
+            size = 1 if subs is None else subs
+            subs_list.append(Subscript(comp_str, i, start, size, subs))
+            raw_runs.append((Element(comp_str[i:start]), size, group))
+            positions.append(i)
+            i = end
+        elif char in HYDRATE_DELIMS and not stack:
+            subs, end = read_digits(comp_str, i + 1)
+            parents.append(0)
+            multipliers.append(1 if subs is None else subs)
+            group = len(parents) - 1
+            i = end
+        elif char == CHARGE_DELIM:
+            charge, end = read_charge(comp_str, i)
+            if charge is None or stack or comp_str[end:].strip():
+                raise ValueError(f'Expected a charge such as `^2-` at the end of `{comp_str}`.')
+            i = end
+        elif char in '+-':
+            raise ValueError(f'Unexpected `{char}` in `{comp_str}`; write a charge as `^{char}` or `^2{char}` '
+                             'at the end of the formula.')
+        else:
+            i += 1
+    if stack:
         raise Exception('Mismatched delims error. Compound={}'.format(comp_str))
-    if ldi is None or rdi is None:
-        return p_list
-    multiplier, no_subs = get_element_count(comp_str, rdi+1)
-    nested = nests_delims(comp_str, ldi+1, rdi-1)
-    original_subs = subs
-    subs *= multiplier
-    p_list.append((ldi, rdi, subs))
-    if nested:
-        ldi += 1
-        rdi -= 1
-    else:
-        ldi = rdi + 1 + (len(str(multiplier)) if no_subs is False else 0)
-        rdi = len(comp_str)
-        subs = original_subs
-    return fetch_multiplier_list(comp_str, ldi, rdi, subs, p_list)
-
-
-def get_multiplier(multiplier_list: list[tuple[int, int, int]], n: int) -> int:
-    mp_list: list[int] = [multiplier
-                       for ldi, rdi, multiplier in multiplier_list
-                       if ldi <= n <= rdi]
-    return mp_list[-1] if len(mp_list) > 0 else 1
+    effective = multipliers.copy()
+    for g in range(1, len(parents)):
+        effective[g] *= effective[parents[g]]
+    counts: Counter[Element] = Counter()
+    runs: list[tuple[Element, int]] = []
+    for element, size, g in raw_runs:
+        count = size * effective[g]
+        counts[element] += count
+        runs.append((element, count))
+    return FormulaTokens(counts, runs, positions, subs_list, charge)
 
 
 def tokenize(comp_str: str) -> tuple[list[Element], list[Subscript]]:
-    elements: list[Element] = []
-    subs_list: list[Subscript] = []
-    multiplier_list = fetch_multiplier_list(comp_str, 0, len(comp_str))
-    multipliers = [get_multiplier(multiplier_list, n) for n in range(len(comp_str))]
-    for i, char in enumerate(comp_str):
-        if char in ALL_DELIMS:
-            subscript = Subscript(comp_str, i, i + 1)
-            subs_list.append(subscript)
-        if char not in ELEMENTS and comp_str[i:i+2] not in ELEMENTS:
-            continue
-        two_letter = comp_str[i:i+2] in ELEMENTS
-        start = i + 2 if two_letter else i + 1
-        subscript = Subscript(comp_str, i, start)
-        count = subscript.size
-        element = comp_str[i:i+2] if two_letter else char
-        subs_list.append(subscript)
-        for _ in range(count * multipliers[i]):
-            elements.append(Element(element))
-    return (elements, subs_list)
\ No newline at end of file
+    """Returns every atom of `comp_str` as a list of `Element`s, along with its subscripts. Prefer `parse_formula` for large formulas."""
+    parsed = parse_formula(comp_str)
+    return (list(TokenView(parsed.runs)), parsed.subscripts)